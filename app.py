@@ -1,13 +1,14 @@
+import logging
 import sys
 from pathlib import Path
 
-import requests
 import streamlit as st
 import pandas as pd
 import re
 import matplotlib as plt
 
-print("USING PYTHON:", sys.executable)
+log = logging.getLogger("nepse_portfoli.app")
+log.debug("using python: %s", sys.executable)
 
 st.set_page_config(layout="wide")
 
@@ -16,24 +17,17 @@ st.set_page_config(layout="wide")
 ROOT = Path(__file__).resolve().parent
 SRC = ROOT / "src"
 
-print("__file__ =", __file__)
-print("ROOT =", ROOT)
+log.debug("__file__ = %s, ROOT = %s", __file__, ROOT)
 
 
 if str(SRC) not in sys.path:
     sys.path.append(str(SRC))
     
-from nepse_portfoli.io.trading_loader import load_trading_sheet, short_name, download_to_temp
+from nepse_portfoli.io.trading_loader import short_name
 
-from nepse_portfoli.app.make_report_pdf import make_pdf_report
-from nepse_portfoli.core.summary_pi import (
-    
-    build_symbol_summary_open,
-    build_sector_summary_raw,
-    realized_profit_by_symbol,
-    plot_sector_pie,
-    load_sector_map,
-)
+from nepse_portfoli.app.report_jobs import PENDING, QueueFull
+from nepse_portfoli.app.st_cache import fetch_bytes, default_source, portfolio_snapshot, report_queue
+from nepse_portfoli.core.chart_cache import SCREEN_DPI, chart_cache
 
 
 
@@ -68,10 +62,9 @@ uploaded_trading = st.file_uploader(
 )
 
 template_url = DEFAULT_TRADING_URL
-r = requests.get(template_url)
 st.download_button(
     "⬇️ Download example trading journal template",
-    r.content,
+    fetch_bytes(template_url),
     "trading_journal_template.xls",
     mime="application/vnd.ms-excel.sheet.macroEnabled.12",
 )
@@ -91,7 +84,7 @@ if uploaded_trading:
     trading_source = uploaded_trading
     st.success(f"Using uploaded trading log: {uploaded_trading.name}")
 else:
-    trading_source = download_to_temp(DEFAULT_TRADING_URL)
+    trading_source = default_source(DEFAULT_TRADING_URL)
     st.info(f"Using default trading log: **{DEFAULT_TRADING_NAME}**")
 
 # price source
@@ -100,7 +93,7 @@ if uploaded_price:
     price_filename = uploaded_price.name
     st.success(f"Using uploaded price file: {uploaded_price.name}")
 else:
-    price_source = download_to_temp(DEFAULT_PRICE_URL)
+    price_source = default_source(DEFAULT_PRICE_URL)
     price_filename = DEFAULT_PRICE_NAME
     st.info(f"Using default price file: **{DEFAULT_PRICE_NAME}**")
 
@@ -126,47 +119,77 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+sector_info_file = ROOT / "data" / "Sector_info.csv"
+
+show_timings = st.checkbox("Show timings", help="wall/CPU time and peak memory per stage")
+
 if st.button("Generate PDF"):
+    # rendered by the background job queue; identical inputs share one job
     try:
-        # trading
-        port_df = load_trading_sheet(trading_source, sheet_name)
+        # the cached snapshot below: the job only renders it
+        snapshot, price_date = portfolio_snapshot(
+            trading_source, price_source, price_filename, sheet_name, sector_info_file
+        )
+        st.session_state["report_job"] = report_queue().submit(
+            snapshot, price_date,
+            journal=trading_source, price=price_source, sheet=sheet_name,
+            profile=show_timings,
+        )
+    except QueueFull as e:
+        st.warning(str(e))
 
-        # sector
-        ROOT = Path(__file__).resolve().parent
-        sector_info_file = ROOT / "data" / "Sector_info.csv"
 
-        sector_df = load_sector_map(sector_info_file)
+@st.fragment(run_every=1.0)
+def wait_for_report(job_id):
+    # polls without re-running the page; a full rerun once the job finishes
+    job = report_queue().status(job_id)
+    if job["state"] not in PENDING:
+        st.rerun()
+    st.info(f"⏳ Report {job['state']}… ({job['waited'] or 0:.0f}s)")
 
-        # price
-        if str(price_source.name).lower().endswith(".csv"):
-            price_df = pd.read_csv(price_source, engine="python", on_bad_lines="skip")
-        else:
-            price_df = pd.read_excel(price_source)
 
-        # ️⃣ FIRST — build PDF + download button
-        pdf = make_pdf_report(trading_source, price_source, sheet_name, price_col)
+if "report_job" in st.session_state:
+    try:
+        # ️⃣ FIRST — PDF status + download button
+        job = report_queue().status(st.session_state["report_job"])
+        if job["state"] in PENDING:
+            wait_for_report(job["id"])
+        elif job["state"] == "failed":
+            st.error(f"Report failed: {job['error']}")
+        elif job["state"] == "done":
+            st.success("Report created!")
+            st.download_button(
+                "Download PDF",
+                data=job["pdf"],  # in memory: no file to re-open or clean up
+                file_name="portfolio_report.pdf",
+                mime="application/pdf",
+            )
+            if show_timings and job["timings"]:
+                report = job["timings"]
+                with st.expander(f"⏱️ Timings — {report['wall_s']:.2f}s total", expanded=True):
+                    st.dataframe(pd.DataFrame(report["stages"]), hide_index=True)
+                    st.caption("Measured in the report worker; a shared (deduplicated) report has no timings.")
+        else:
+            st.info("That report has expired — generate it again.")
 
-        st.success("Report created!")
-        st.download_button(
-            "Download PDF",
-            data=open(pdf, "rb"),
-            file_name="portfolio_report.pdf",
-            mime="application/pdf",
+        # every view below (totals, tables) shares this one snapshot,
+        # cached by the content hash of the journal and price file
+        snapshot, price_date = portfolio_snapshot(
+            trading_source, price_source, price_filename, sheet_name, sector_info_file
         )
 
         # THEN summaries + charts
-        symbol_summary = build_symbol_summary_open(port_df, price_df, sector_df)
-        sector_summary = build_sector_summary_raw(port_df, price_df, sector_df)
-        realized_df = realized_profit_by_symbol(port_df)
-
-        sector_summary = build_sector_summary_raw(port_df, price_df, sector_df)
-        realized_df = realized_profit_by_symbol(port_df)
-
-        total_inv = pd.to_numeric(sector_summary["Investment_NPR"], errors="coerce").fillna(0).sum()
-        total_mv  = pd.to_numeric(sector_summary["Market_Value_NPR"], errors="coerce").fillna(0).sum()
-        total_realized = pd.to_numeric(
-            realized_df["Realized_Profit_NPR"], errors="coerce"
-        ).fillna(0).sum() if not realized_df.empty else 0
+        symbol_summary = snapshot.symbol_summary()
+        sector_summary = snapshot.sector_summary()
+
+        totals = snapshot.totals()
+        total_inv = totals["total_inv"]
+        total_mv = totals["total_mv"]
+        total_realized = totals["total_realized"]
+        unmapped = snapshot.unmapped_symbols()
+        if unmapped:
+            st.warning(f"No sector for {len(unmapped)} symbol(s), shown as Unknown: {', '.join(unmapped)}")
+
         st.subheader("📄 Portfolio — Open Positions")
         st.markdown(
             f"**Total Investment:** NPR {total_inv:,.0f} | "
@@ -177,15 +200,28 @@ if st.button("Generate PDF"):
 
         
 
-        st.dataframe(symbol_summary)
+        # numeric columns, formatted by the grid so sorting stays numeric
+        npr = st.column_config.NumberColumn(format="localized")
+        st.dataframe(
+            symbol_summary,
+            column_config={
+                "Total Kitta": npr,
+                "Current share Price": npr,
+                "Buy share price": npr,
+                "Investment_NPR": npr,
+                "Market_Value_NPR": npr,
+                "PL": npr,
+                "PL%": st.column_config.NumberColumn(format="percent"),
+            },
+            hide_index=True,
+        )
 
-        fig = plot_sector_pie(sector_summary)
-        fig.set_size_inches(1, 1)
-        # higher resolution
-        fig.set_dpi(1400)
-        for text in fig.axes[0].texts:
-            text.set_fontsize(2)
-        #st.pyplot(fig)
+        # cached PNG bytes (same store as the PDF's pie), drawn at screen DPI
+        st.subheader("🥧 Sector Allocation")
+        st.image(
+            chart_cache.sector_pie(sector_summary, fmt="png", size=(6, 6), dpi=SCREEN_DPI),
+            width=600,
+        )
 
     except Exception as e:
         st.error(f"Error: {e}")
@@ -0,0 +1,86 @@
+# Import-time guard for the library layer.
+#
+# Every module is imported in a fresh interpreter (no warm sys.modules), and
+# the check fails when
+#   - a core/io/headless module pulls in a UI package (streamlit), or
+#   - its cold import takes longer than its budget.
+# Budgets are generous (slow CI runners) -- they catch "imports streamlit
+# again" or "imports pyplot at the top of core", not 10% drifts.
+#
+# Usage:
+#   PYTHONPATH=src python benchmarks/bench_imports.py            # exit 1 on regression
+#   PYTHONPATH=src python benchmarks/bench_imports.py --repeat 5
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+FORBIDDEN = ["streamlit"]
+
+# module -> cold-import budget in seconds
+BUDGETS = {
+    "nepse_portfoli.core.snapshot": 1.5,
+    "nepse_portfoli.core.formatters": 1.5,
+    "nepse_portfoli.core.summary_pi": 1.5,
+    "nepse_portfoli.core.valuation": 1.5,
+    "nepse_portfoli.core.chart_cache": 1.5,
+    "nepse_portfoli.io.read_price_file": 1.5,
+    "nepse_portfoli.io.trading_loader": 2.0,
+    "nepse_portfoli.io.price_store": 1.5,
+    "nepse_portfoli.io.export": 1.5,
+    "nepse_portfoli.app.cli": 0.5,
+    "nepse_portfoli.app.make_report_pdf": 3.0,
+    "nepse_portfoli.app.batch": 2.0,
+}
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+dt = time.perf_counter() - t0
+print(json.dumps({{"seconds": dt, "modules": sorted(m for m in sys.modules if "." not in m)}}))
+"""
+
+
+def cold_import(module: str) -> dict:
+    env = dict(os.environ, MPLBACKEND="Agg")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold import times of nepse_portfoli modules")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per module (best is kept)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'module':<38} {'best s':>8} {'budget':>8}  heavy")
+    for module, budget in BUDGETS.items():
+        runs = [cold_import(module) for _ in range(args.repeat)]
+        best = min(r["seconds"] for r in runs)
+        loaded = set(runs[0]["modules"])
+
+        heavy = [m for m in ("pandas", "matplotlib", "streamlit") if m in loaded]
+        print(f"{module:<38} {best:>8.3f} {budget:>8.1f}  {','.join(heavy)}")
+
+        for bad in FORBIDDEN:
+            if bad in loaded:
+                failures.append(f"{module} imports {bad}")
+        if best > budget:
+            failures.append(f"{module} took {best:.2f}s (budget {budget:.1f}s)")
+
+    for f in failures:
+        print("FAIL", f)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
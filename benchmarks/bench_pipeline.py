@@ -0,0 +1,318 @@
+# End-to-end stage timings on synthetic portfolios of 100 / 10k / 1M lots.
+#
+# Generates a trading journal laid out like data/trading_journal_template.xls
+# (header on row 4, columns B:O, position o/c) and a NEPSE "Today's Price"
+# CSV with the full NEPSE header, then times each stage:
+#
+#   load_trading_sheet, load_price_file, build_symbol_summary_open,
+#   build_sector_summary_raw, realized_profit_by_symbol (journal/fifo/average),
+#   make_pdf_report
+#
+# Every stage runs under core/profiling.Profiler: one pass for wall/CPU time
+# (best of --repeat) and, unless --no-memory, one pass under tracemalloc for
+# peak memory (tracemalloc slows the code it watches, so it is not timed).
+# Results go to a JSON file that a later run can be compared against:
+#
+# Usage:
+#   PYTHONPATH=src python benchmarks/bench_pipeline.py --save output/bench_pipeline.json
+#   PYTHONPATH=src python benchmarks/bench_pipeline.py --compare output/bench_pipeline.json
+#   PYTHONPATH=src python benchmarks/bench_pipeline.py --sizes 100 10k 1M --xlsx-max 10k
+#
+# Writing and parsing a 1M-row .xlsx takes minutes, so journals above
+# --xlsx-max lots skip the load_trading_sheet stage and start from the frame.
+# Generated files are kept in <cache dir>/bench/ (NEPSE_CACHE_DIR, default .cache/)
+# and reused by later runs.
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from nepse_portfoli.app.make_report_pdf import make_pdf_report
+from nepse_portfoli.config.paths import CACHE_DIR, SECTOR_INFO_FILE
+from nepse_portfoli.core.profiling import Profiler, span
+from nepse_portfoli.core.summary_pi import (
+    build_sector_summary_raw,
+    build_symbol_summary_open,
+    load_sector_map,
+    realized_profit_by_symbol,
+)
+from nepse_portfoli.io.read_price_file import load_price_file
+from nepse_portfoli.io.sector_registry import read_sector_csv
+from nepse_portfoli.io.trading_loader import load_trading_sheet
+
+WORK_DIR = CACHE_DIR / "bench"
+
+JOURNAL_COLUMNS = [
+    "Symbol", "Open date", "position", "Closed date", "Sell price", "Buy price",
+    "Buy kitta", "Market price", "Bonus share", "79-80", " 078-79", "  077-78",
+    "Feezed  (locked)", "Total holding",
+]
+PRICE_HEADER = [
+    "Id", "Business Date", "Security Id", "Symbol", "Security Name", "Open Price",
+    "High Price", "Low Price", "Close Price", "Total Traded Quantity",
+    "Total Traded Value", "Previous Day Close Price", "Fifty Two Week High",
+    "Fifty Two Week Low", "Last Updated Time", "Last Updated Price", "Total Trades",
+    "Average Traded Price", "Market Capitalization",
+]
+PRICE_DATE = "2025-12-21"
+SHEET = "Keshav"
+
+# a regression is a stage this much slower (or hungrier) than the baseline
+TOLERANCE = 1.5
+
+
+def parse_size(text: str) -> int:
+    text = text.lower().replace("_", "")
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+# ------------------------------------------------------------
+# SYNTHETIC DATA
+# ------------------------------------------------------------
+def universe(n_symbols: int) -> list:
+    """Real NEPSE symbols (so most map to a sector), padded with made-up ones."""
+    real = read_sector_csv(SECTOR_INFO_FILE)["Symbol"].tolist()
+    extra = [f"SYN{i:04d}" for i in range(max(0, n_symbols - len(real)))]
+    return (real + extra)[:n_symbols]
+
+
+def synthetic_prices(symbols: list, seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n = len(symbols)
+    close = rng.uniform(150, 1500, n).round(1)
+    prev = (close * rng.uniform(0.95, 1.05, n)).round(1)
+    qty = rng.integers(100, 200_000, n)
+    return pd.DataFrame({
+        "Id": np.arange(1, n + 1),
+        "Business Date": PRICE_DATE,
+        "Security Id": np.arange(100, 100 + n),
+        "Symbol": symbols,
+        "Security Name": [f"{s} Limited" for s in symbols],
+        "Open Price": prev,
+        "High Price": np.maximum(prev, close) * 1.01,
+        "Low Price": np.minimum(prev, close) * 0.99,
+        "Close Price": close,
+        "Total Traded Quantity": qty,
+        "Total Traded Value": (qty * close).round(1),
+        "Previous Day Close Price": prev,
+        "Fifty Two Week High": (close * 1.3).round(1),
+        "Fifty Two Week Low": (close * 0.7).round(1),
+        "Last Updated Time": f"{PRICE_DATE}T14:59:59.000000",
+        "Last Updated Price": close,
+        "Total Trades": rng.integers(1, 2000, n),
+        "Average Traded Price": close,
+        "Market Capitalization": (close * rng.uniform(100, 1000, n)).round(2),
+    })[PRICE_HEADER]
+
+
+def synthetic_journal(n_lots: int, symbols: list, prices: pd.DataFrame, seed=0) -> pd.DataFrame:
+    """Journal rows like the template: ~30% closed ("c"), the rest open ("o")."""
+    rng = np.random.default_rng(seed)
+    last = prices.set_index("Symbol")["Last Updated Price"]
+
+    sym = np.asarray(symbols, dtype=object)[rng.integers(0, len(symbols), n_lots)]
+    ref = last.reindex(sym).to_numpy()
+    buy = (ref * rng.uniform(0.6, 1.4, n_lots)).round(1)
+    kitta = rng.integers(1, 50, n_lots) * 10.0
+
+    end = np.datetime64(PRICE_DATE)
+    opened = end - rng.integers(30, 5 * 365, n_lots).astype("timedelta64[D]")
+    closed = rng.random(n_lots) < 0.3
+    close_date = opened + rng.integers(1, 30, n_lots).astype("timedelta64[D]")
+
+    df = pd.DataFrame({c: np.nan for c in JOURNAL_COLUMNS}, index=range(n_lots))
+    df["Symbol"] = sym
+    df["Open date"] = pd.to_datetime(opened)
+    df["position"] = np.where(closed, "c", "o")
+    df["Closed date"] = pd.to_datetime(np.where(closed, close_date, np.datetime64("NaT")))
+    df["Sell price"] = np.where(closed, (buy * rng.uniform(0.8, 1.3, n_lots)).round(1), np.nan)
+    df["Buy price"] = buy
+    df["Buy kitta"] = kitta
+    df["Total holding"] = kitta
+    return df
+
+
+def write_journal_xlsx(df: pd.DataFrame, path: Path, sheet=SHEET) -> None:
+    """Template layout: note on row 2, header on row 4 from column B."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet)
+    ws.append([])
+    ws.append([None, "Do not change the Excel table layout."])
+    ws.append([])
+    ws.append(["registered in Mero Share(OK)"] + JOURNAL_COLUMNS)
+
+    cols = [df[c].astype(object).where(df[c].notna(), None).tolist() for c in JOURNAL_COLUMNS]
+    for row in zip(*cols):
+        ws.append(["OK", *row])
+    wb.save(path)
+
+
+def dataset(n_lots: int, xlsx_max: int, seed=0, symbols=None) -> dict:
+    """Paths/frames for one size; files are generated once per (size, seed)."""
+    n_symbols = symbols or int(np.clip(n_lots // 5, 20, 400))
+    base = WORK_DIR / f"lots{n_lots}_sym{n_symbols}_seed{seed}"
+    base.mkdir(parents=True, exist_ok=True)
+
+    syms = universe(n_symbols)
+    prices = synthetic_prices(syms, seed)
+    price_csv = base / f"Today's Price - {PRICE_DATE}.csv"
+    if not price_csv.exists():
+        prices.to_csv(price_csv, index=False)
+
+    journal = synthetic_journal(n_lots, syms, prices, seed)
+    xlsx = base / "journal.xlsx"
+    if n_lots <= xlsx_max and not xlsx.exists():
+        print(f"  writing {xlsx} ...", flush=True)
+        write_journal_xlsx(journal, xlsx)
+
+    return {
+        "journal": journal,
+        "journal_xlsx": xlsx if n_lots <= xlsx_max else None,
+        "price_csv": price_csv,
+        "symbols": n_symbols,
+    }
+
+
+# ------------------------------------------------------------
+# STAGES
+# ------------------------------------------------------------
+def run_stages(data: dict, out_dir: Path) -> None:
+    """Every stage once, each under its own span."""
+    if data["journal_xlsx"] is not None:
+        with span("load_trading_sheet"):
+            df_port = load_trading_sheet(data["journal_xlsx"], SHEET, use_cache=False)
+    else:
+        df_port = data["journal"]
+
+    with span("load_price_file"):
+        price_df = load_price_file(data["price_csv"], use_cache=False)
+    sector_df = load_sector_map(SECTOR_INFO_FILE)
+
+    with span("build_symbol_summary_open"):
+        build_symbol_summary_open(df_port, price_df, sector_df)
+    with span("build_sector_summary_raw"):
+        build_sector_summary_raw(df_port, price_df, sector_df)
+    for method in (None, "fifo", "average"):
+        with span(f"realized_profit_by_symbol[{method or 'journal'}]"):
+            realized_profit_by_symbol(df_port, method)
+    with span("make_pdf_report"):
+        make_pdf_report(
+            df_port=df_port, price_df=price_df, sector_df=sector_df,
+            price_date=PRICE_DATE, out_path=out_dir / "report.pdf",
+        )
+
+
+def measure(data: dict, repeat: int, memory: bool) -> dict:
+    """{stage path: {wall_s, cpu_s, peak_kb}}; time is the best of ``repeat``."""
+    stages = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeat):
+            with Profiler("bench") as prof:
+                run_stages(data, Path(tmp))
+            for st in prof.stages():
+                best = stages.setdefault(st["path"], {"wall_s": st["wall_s"], "cpu_s": st["cpu_s"], "peak_kb": None})
+                if st["wall_s"] < best["wall_s"]:
+                    best.update(wall_s=st["wall_s"], cpu_s=st["cpu_s"])
+
+        if memory:
+            with Profiler("bench", memory=True) as prof:
+                run_stages(data, Path(tmp))
+            for st in prof.stages():
+                stages[st["path"]]["peak_kb"] = st["peak_kb"]
+    return stages
+
+
+# ------------------------------------------------------------
+# BASELINE
+# ------------------------------------------------------------
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(result: dict, baseline: dict, tolerance=TOLERANCE) -> list:
+    """Stages slower / using more memory than ``tolerance`` x the baseline."""
+    failures = []
+    for size, stages in result["sizes"].items():
+        for path, now in stages.items():
+            before = baseline.get("sizes", {}).get(size, {}).get(path)
+            if before is None:
+                continue
+            for key in ("wall_s", "peak_kb"):
+                # ignore sub-10ms / sub-100KB noise
+                floor = 0.01 if key == "wall_s" else 100
+                if now.get(key) is None or before.get(key) is None:
+                    continue
+                if now[key] > max(before[key], floor) * tolerance:
+                    failures.append(
+                        f"{size} lots {path}: {key} {now[key]:,.3f} vs {before[key]:,.3f} "
+                        f"(baseline {baseline.get('commit', '?')})"
+                    )
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stage timings on synthetic NEPSE portfolios")
+    parser.add_argument("--sizes", nargs="+", default=["100", "10k", "1M"],
+                        help="journal sizes in lots (k/M suffixes allowed)")
+    parser.add_argument("--symbols", type=int, help="symbols per portfolio (default: lots/5, 20..400)")
+    parser.add_argument("--xlsx-max", default="10k",
+                        help="largest journal written as .xlsx for the load stage")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to compare against (exit 1 on regression)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    result = {"commit": git_commit(), "repeat": args.repeat, "sizes": {}}
+    xlsx_max = parse_size(args.xlsx_max)
+
+    for size in args.sizes:
+        n_lots = parse_size(size)
+        print(f"{n_lots:,} lots", flush=True)
+        data = dataset(n_lots, xlsx_max, args.seed, args.symbols)
+        stages = measure(data, args.repeat, memory=not args.no_memory)
+        result["sizes"][str(n_lots)] = stages
+
+        print(f"  {'stage':<56} {'wall s':>9} {'cpu s':>9} {'peak MB':>9}")
+        for path, st in stages.items():
+            peak = f"{st['peak_kb'] / 1024:9.1f}" if st["peak_kb"] is not None else f"{'-':>9}"
+            print(f"  {path:<56} {st['wall_s']:>9.3f} {st['cpu_s']:>9.3f} {peak}")
+
+    if args.save:
+        path = Path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(result, indent=2))
+        print(f"saved {path}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        failures = compare(result, baseline, args.tolerance)
+        for f in failures:
+            print("FAIL", f)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+# Compare the old price-file read (python engine, on_bad_lines="skip") with
+# read_price_file.read_price_csv (C engine + dtypes) on the NEPSE files in
+# data/, and on each file repeated to a larger synthetic size.
+#
+# Usage:
+#   PYTHONPATH=src python benchmarks/bench_price_reader.py [repeat_factor ...]
+import glob
+import io
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from nepse_portfoli.io.read_price_file import read_price_csv
+
+DATA = Path(__file__).resolve().parents[1] / "data"
+
+
+def legacy(buf):
+    buf.seek(0)
+    df = pd.read_csv(buf, engine="python", on_bad_lines="skip")
+    df.columns = [c.strip() for c in df.columns]
+    return df
+
+
+def fast(buf):
+    return read_price_csv(buf)[0]
+
+
+def bench(fn, data: bytes, repeat=5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        buf = io.BytesIO(data)
+        t0 = time.perf_counter()
+        fn(buf)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def scaled(data: bytes, factor: int) -> bytes:
+    header, _, body = data.partition(b"\n")
+    return header + b"\n" + body * factor
+
+
+def main(factors):
+    files = sorted(glob.glob(str(DATA / "Today's Price - *.csv")))
+    print(f"{'file':<34} {'rows':>8} {'python s':>10} {'C s':>10} {'speedup':>8}")
+    for f in files:
+        raw = Path(f).read_bytes()
+        for factor in factors:
+            data = scaled(raw, factor)
+            rows = data.count(b"\n")
+            t_old = bench(legacy, data)
+            t_new = bench(fast, data)
+            print(f"{Path(f).name:<34} {rows:>8} {t_old:>10.4f} {t_new:>10.4f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1, 100])
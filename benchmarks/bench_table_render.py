@@ -0,0 +1,102 @@
+# Compare the legacy matplotlib-Table path (add_table + bbox_inches="tight")
+# with the paginated table_render.draw_table path used by make_pdf_report.
+#
+# Usage:
+#   PYTHONPATH=src python benchmarks/bench_table_render.py [rows ...]
+import io
+import sys
+import time
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from nepse_portfoli.app.make_report_pdf import (
+    COL_WIDTHS,
+    PAGE_SIZE,
+    PDF_COLUMNS,
+    PDF_FORMATS,
+    ROWS_PER_PAGE,
+    TABLE_AXES,
+    add_table,
+    wrap_header,
+)
+from nepse_portfoli.app.table_render import draw_table, page_slices, pl_row_colors
+from nepse_portfoli.core.formatters import format_frame
+
+
+def synthetic_summary(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    kitta = rng.integers(10, 2000, n).astype(float)
+    buy = rng.uniform(100, 1500, n)
+    cur = buy * rng.uniform(0.6, 1.4, n)
+    df = pd.DataFrame({
+        "sn": np.arange(1, n + 1),
+        "Symbol": [f"SYM{i}" for i in range(n)],
+        "Total Kitta": kitta,
+        "Current share Price": cur,
+        "Buy share price": buy,
+        "Investment_NPR": kitta * buy,
+        "Market_Value_NPR": kitta * cur,
+    })
+    df["PL"] = df["Market_Value_NPR"] - df["Investment_NPR"]
+    df["PL%"] = df["PL"] / df["Investment_NPR"]
+    df["Sector"] = rng.choice(["CB", "DB", "HP", "LI", "MF"], n)
+    return df.rename(columns=PDF_COLUMNS)
+
+
+def legacy(df: pd.DataFrame) -> int:
+    buf = io.BytesIO()
+    with PdfPages(buf) as pdf:
+        fig = plt.figure(figsize=PAGE_SIZE)
+        ax = fig.add_axes([0.02, 0.08, 0.98, 0.82])
+        ax.axis("off")
+        add_table(ax, df, formats=PDF_FORMATS)
+        pdf.savefig(fig, bbox_inches="tight")
+        plt.close(fig)
+    return buf.tell()
+
+
+def fast(df: pd.DataFrame) -> int:
+    cells = format_frame(df, PDF_FORMATS).fillna("").astype(str).to_numpy()
+    headers = [wrap_header(c) for c in df.columns]
+    colors = pl_row_colors(df["PL%"])
+
+    buf = io.BytesIO()
+    with PdfPages(buf) as pdf:
+        for rows in page_slices(len(cells), ROWS_PER_PAGE):
+            fig = plt.figure(figsize=PAGE_SIZE)
+            ax = fig.add_axes(TABLE_AXES)
+            draw_table(ax, cells[rows], headers, COL_WIDTHS, colors[rows], capacity=ROWS_PER_PAGE)
+            pdf.savefig(fig)
+            plt.close(fig)
+    return buf.tell()
+
+
+def bench(fn, df, repeat=3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(df)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(sizes):
+    print(f"{'rows':>6} {'legacy s':>10} {'fast s':>10} {'speedup':>8}")
+    for n in sizes:
+        df = synthetic_summary(n)
+        t_old = bench(legacy, df)
+        t_new = bench(fast, df)
+        print(f"{n:>6} {t_old:>10.3f} {t_new:>10.3f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [30, 200, 1000])
@@ -20,5 +20,5 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 cd "$SCRIPT_DIR"
 
 source .venv/bin/activate
-PYTHONPATH=src python src/nepse_portfoli/app/make_report_pdf.py
+./nepse-report
 
@@ -0,0 +1,199 @@
+# batch PDF reports: many journal sheets x many price dates
+#
+# The workbook, the price inputs and the sector map are loaded once in the
+# parent; every (sheet, price) pair then becomes a job rendered in a process
+# pool, because matplotlib rendering is CPU-bound and holds the GIL.  Each
+# job writes its own file: <out_dir>/<sheet>_<price date>.pdf (sheet names
+# that sanitize to the same text get their index in the workbook appended).
+#
+# Usage:
+#   python -m nepse_portfoli.app.batch --journal data/journal.xlsm \
+#       --sheets Keshav Sita --prices "data/Today's Price - *.csv"
+#   python -m nepse_portfoli.app.batch --journal data/journal.xlsm --dates 2025-12-14 2025-12-21
+import argparse
+import glob
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from nepse_portfoli.config.paths import ROOT, SECTOR_INFO_FILE
+from nepse_portfoli.core.summary_pi import load_sector_map
+from nepse_portfoli.io.price_store import PriceStore
+from nepse_portfoli.io.read_price_file import load_price_file, get_price_date
+from nepse_portfoli.io.trading_loader import load_trading_sheets, short_name
+
+
+BATCH_DIR = ROOT / "output" / "batch"
+
+
+def _safe(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(text)).strip("_") or "report"
+
+
+def _sheet_stems(sheets) -> dict:
+    """File-name stem per sheet; names that sanitize alike get the sheet's index."""
+    safe = {sheet: _safe(sheet) for sheet in sheets}
+    counts = Counter(safe.values())
+
+    stems, used = {}, set()
+    for i, sheet in enumerate(sheets, 1):
+        stem = safe[sheet]
+        if counts[stem] > 1 or stem in used:
+            stem = f"{stem}_{i}"
+            while stem in used or stem in counts:
+                stem += "_"
+        stems[sheet] = stem
+        used.add(stem)
+    return stems
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render_job(job: dict) -> dict:
+    from nepse_portfoli.app.make_report_pdf import make_pdf_report
+
+    t0 = time.perf_counter()
+    try:
+        path = make_pdf_report(
+            df_port=job["df_port"],
+            price_df=job["price_df"],
+            sector_df=job["sector_df"],
+            price_date=job["price_date"],
+            out_path=job["out_path"],
+        )
+        error = None
+    except Exception as e:  # one bad sheet must not sink the batch
+        path, error = None, f"{type(e).__name__}: {e}"
+
+    return {
+        "sheet": job["sheet"],
+        "price_date": job["price_date"],
+        "path": path,
+        "error": error,
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def _price_inputs(price_files=None, price_dates=None, store=None) -> list:
+    """[(price date, price frame)] from files and/or price-store dates.
+
+    One entry per date (files win over the store), since the date is part
+    of the output file name.
+    """
+    prices = {}
+    for f in price_files or []:
+        df = load_price_file(f)
+        prices.setdefault(get_price_date(df, short_name(f)), df)
+
+    if price_dates:
+        store = store or PriceStore()
+        for day in price_dates:
+            resolved = store.resolve_date(day)
+            if resolved not in prices:
+                prices[resolved] = store.price_frame(resolved)
+
+    if not prices:
+        raise ValueError("Give at least one price file or price date")
+    return sorted(prices.items())
+
+
+def run_batch(
+    journal,
+    sheets=None,
+    price_files=None,
+    price_dates=None,
+    out_dir=BATCH_DIR,
+    workers=None,
+    store=None,
+    sector_file=SECTOR_INFO_FILE,
+) -> list:
+    """Render one report per (sheet, price) pair; returns per-job results.
+
+    ``sheets=None`` renders every journal-shaped sheet in the workbook.
+    ``workers=1`` renders in-process (no pool), handy for debugging.
+    """
+    journals = load_trading_sheets(journal, sheets)
+    if not journals:
+        raise ValueError(f"No trading journal sheets found in {journal}")
+
+    prices = _price_inputs(price_files, price_dates, store)
+    sector_df = load_sector_map(sector_file, workbook=journal)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # "Ram Sita" and "Ram/Sita" must not write the same file
+    stems = _sheet_stems(list(journals))
+
+    jobs = [
+        {
+            "sheet": sheet,
+            "df_port": df_port,
+            "price_df": price_df,
+            "sector_df": sector_df,
+            "price_date": price_date,
+            "out_path": out_dir / f"{stems[sheet]}_{_safe(price_date)}.pdf",
+        }
+        for sheet, df_port in journals.items()
+        for price_date, price_df in prices
+    ]
+
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1:
+        _init_worker()
+        return [_render_job(job) for job in jobs]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_render_job, job) for job in jobs]
+        for fut in as_completed(futures):
+            results.append(fut.result())
+
+    order = {(j["sheet"], j["price_date"]): i for i, j in enumerate(jobs)}
+    return sorted(results, key=lambda r: order[(r["sheet"], r["price_date"])])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render NEPSE reports for many sheets and dates")
+    parser.add_argument("--journal", required=True, help="trading journal workbook (.xls/.xlsm)")
+    parser.add_argument("--sheets", nargs="*", help="sheet names (default: every journal sheet)")
+    parser.add_argument("--prices", nargs="*", default=[], help="price files or glob patterns")
+    parser.add_argument("--dates", nargs="*", default=[], help="dates from the price store")
+    parser.add_argument("--store", help="price store directory")
+    parser.add_argument("--out-dir", default=str(BATCH_DIR))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    price_files = sorted({f for pattern in args.prices for f in glob.glob(pattern)})
+    store = PriceStore(args.store) if args.store else None
+
+    t0 = time.perf_counter()
+    results = run_batch(
+        args.journal,
+        sheets=args.sheets or None,
+        price_files=price_files,
+        price_dates=args.dates,
+        out_dir=args.out_dir,
+        workers=args.workers,
+        store=store,
+    )
+
+    failed = 0
+    for r in results:
+        if r["error"]:
+            failed += 1
+            print(f"FAILED {r['sheet']} @ {r['price_date']}: {r['error']}")
+        else:
+            print(f"{r['sheet']} @ {r['price_date']}: {r['path']} ({r['seconds']:.1f}s)")
+
+    print(f"{len(results) - failed}/{len(results)} reports in {time.perf_counter() - t0:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+# headless report entry point (cron / CI / GitHub Actions)
+#
+# Only the standard library is imported at module level: argument errors and
+# --help return without loading pandas or matplotlib, and the Agg backend is
+# selected before pyplot is imported so no GUI toolkit is probed.
+#
+# Usage:
+#   ./nepse-report --journal data/NEPSE_Kavrelibis_2025.xlsm --sheet Keshav
+#   ./nepse-report --price "data/Today's Price - 2025-12-21.csv" -o output/report.pdf
+#   ./nepse-report --date 2025-12-21          # prices from the price store
+#   ./nepse-report --incremental              # nightly: only changed symbols
+#   ./nepse-report -v --profile output/timings.json   # stage timings as JSON
+#   ./nepse-report --export output/export --export-format xlsx parquet --export-history
+import argparse
+import logging
+import os
+import re
+import time
+from pathlib import Path
+
+from nepse_portfoli.config.paths import DATA_DIR, ROOT, SECTOR_INFO_FILE
+
+
+DEFAULT_JOURNAL = DATA_DIR / "trading_journal_template.xls"
+DEFAULT_OUTPUT = ROOT / "output" / "nepse_portfolio_report_latest.pdf"
+
+
+def latest_price_file(data_dir=DATA_DIR):
+    """Newest "Today's Price - YYYY-MM-DD.csv" in ``data_dir`` (by the date in its name)."""
+    files = [
+        p for p in Path(data_dir).glob("Today's Price - *.csv")
+        if re.search(r"\d{4}-\d{2}-\d{2}", p.name)
+    ]
+    if not files:
+        return None
+    return max(files, key=lambda p: re.search(r"\d{4}-\d{2}-\d{2}", p.name).group())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="nepse-report",
+        description="Render the NEPSE portfolio PDF report without the Streamlit app",
+    )
+    parser.add_argument("--journal", default=str(DEFAULT_JOURNAL),
+                        help="trading journal workbook (.xls/.xlsm)")
+    parser.add_argument("--sheet", default="Keshav", help="journal sheet name")
+
+    prices = parser.add_mutually_exclusive_group()
+    prices.add_argument("--price", help="NEPSE price CSV (default: newest in data/)")
+    prices.add_argument("--date", help="price date from the price store instead of a CSV")
+    parser.add_argument("--store", help="price store directory (with --date)")
+
+    parser.add_argument("-o", "--output", default=str(DEFAULT_OUTPUT), help="PDF to write")
+    parser.add_argument("--no-sector-pages", action="store_true",
+                        help="skip the per-sector detail pages")
+    parser.add_argument("--realized", choices=["journal", "fifo", "average"], default="journal",
+                        help="realized P/L: each closed row at its own buy price (journal), "
+                             "or sells matched to buys first-in-first-out / at average cost")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reuse per-symbol results from the last run; only "
+                             "symbols with new/edited lots or moved prices are recomputed")
+    parser.add_argument("--export", metavar="DIR",
+                        help="also write the summaries as numeric tables to DIR")
+    parser.add_argument("--export-format", nargs="+", default=["xlsx"],
+                        choices=["xlsx", "parquet", "arrow"],
+                        help="export formats (parquet/arrow need pyarrow)")
+    parser.add_argument("--export-history", action="store_true",
+                        help="add the valuation time series over every price-store date")
+    parser.add_argument("--profile", metavar="JSON",
+                        help="write per-stage wall/CPU time and peak memory to this file")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="log progress (-v) or debug output (-vv)")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.incremental and args.export_history:
+        # the incremental engine keeps per-symbol sums, not the lots the
+        # time series is valued from
+        parser.error("--export-history needs the full lots; drop --incremental")
+
+    logging.basicConfig(
+        level={0: logging.WARNING, 1: logging.INFO}.get(args.verbose, logging.DEBUG),
+        format="%(levelname)s %(name)s: %(message)s",
+    )
+
+    # before anything imports pyplot
+    os.environ["MPLBACKEND"] = "Agg"
+    import matplotlib
+    matplotlib.use("Agg")
+
+    from nepse_portfoli.core.profiling import Profiler
+
+    if not args.profile:
+        return _run(args)
+
+    with Profiler("nepse-report", memory=True) as prof:
+        status = _run(args)
+    print(f"timings: {prof.save(args.profile)}")
+    return status
+
+
+def _run(args) -> int:
+    from nepse_portfoli.core.profiling import span
+
+    with span("import"):
+        from nepse_portfoli.app.make_report_pdf import make_pdf_report
+
+    t0 = time.perf_counter()
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    from nepse_portfoli.core.summary_pi import load_sector_map
+    from nepse_portfoli.io.trading_loader import load_trading_sheet, short_name
+
+    with span("load/price"):
+        if args.date:
+            from nepse_portfoli.io.price_store import PriceStore
+
+            store = PriceStore(args.store) if args.store else PriceStore()
+            price_date = store.resolve_date(args.date)
+            price_df = store.price_frame(price_date)
+        else:
+            from nepse_portfoli.io.read_price_file import load_price_file, get_price_date
+
+            price = args.price or latest_price_file()
+            if price is None:
+                raise SystemExit(f"No price file given and none found in {DATA_DIR}")
+            price_df = load_price_file(str(price))
+            price_date = get_price_date(price_df, short_name(str(price)))
+
+    with span("load/journal"):
+        df_port = load_trading_sheet(args.journal, args.sheet)
+    with span("load/sectors"):
+        sector_df = load_sector_map(SECTOR_INFO_FILE, workbook=args.journal)
+
+    realized_method = None if args.realized == "journal" else args.realized
+    if args.incremental:
+        from nepse_portfoli.core.incremental import IncrementalPortfolio
+
+        with span("merge", incremental=True):
+            summaries = IncrementalPortfolio.for_journal(
+                args.journal, args.sheet, realized_method=realized_method,
+            ).update(df_port, price_df, sector_df)
+        print(f"incremental: {len(summaries.recomputed)}/{len(summaries.state)} symbols recomputed")
+    else:
+        from nepse_portfoli.core.snapshot import PortfolioSnapshot
+
+        with span("merge"):
+            summaries = PortfolioSnapshot(df_port, price_df, sector_df, realized_method=realized_method)
+
+    if not args.incremental:
+        unmapped = summaries.unmapped_symbols()
+        if unmapped:
+            print(f"no sector for {len(unmapped)} symbol(s), shown as Unknown: {', '.join(unmapped)}")
+
+    path = make_pdf_report(
+        snapshot=summaries,
+        price_date=price_date,
+        out_path=out,
+        sector_pages=not args.no_sector_pages,
+    )
+
+    print(f"PDF created: {path} ({time.perf_counter() - t0:.1f}s)")
+
+    if args.export:
+        from nepse_portfoli.io.export import export_summaries
+        from nepse_portfoli.io.price_store import PriceStore
+
+        store = None
+        if args.export_history:
+            store = PriceStore(args.store) if args.store else PriceStore()
+        with span("export"):
+            paths = export_summaries(summaries, args.export, args.export_format, store=store)
+        for name, p in paths.items():
+            print(f"exported {name}: {p}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
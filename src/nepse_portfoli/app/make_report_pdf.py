@@ -1,35 +1,39 @@
 from __future__ import annotations
 
 
-import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 from pathlib import Path
+import io
+import logging
 import sys
-import re
 
 # make sure project root is importable
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
+from nepse_portfoli.core.profiling import span
+from nepse_portfoli.core.snapshot import PortfolioSnapshot
+from nepse_portfoli.core.formatters import (
+    SYMBOL_SUMMARY_FORMATS,
+    format_frame,
+    renamed_formats,
+)
+from nepse_portfoli.app.table_render import draw_table, page_slices, pl_row_colors
 from nepse_portfoli.core.summary_pi import (
-    build_symbol_summary_open,
-    build_sector_summary_raw,
     plot_sector_pie,
-    realized_profit_by_symbol,
     load_sector_map,
-    
 )
-# 
-from nepse_portfoli.io.portfolio_io import read_portfolio
     # NOTE: load_price_file already works with uploaded Streamlit files
-from nepse_portfoli.io.read_price_file import load_price_file
+from nepse_portfoli.io.atomic import atomic_write
+from nepse_portfoli.io.read_price_file import load_price_file, get_price_date
 
 #from app import load_trading_sheet   # add at top if needed
 
-from nepse_portfoli.io.trading_loader import load_trading_sheet
+from nepse_portfoli.io.trading_loader import load_trading_sheet, short_name
+from nepse_portfoli.config.paths import SECTOR_INFO_FILE
 
 
 # def load_sector_map(sector_info_file) -> pd.DataFrame:
@@ -44,10 +48,33 @@ from nepse_portfoli.io.trading_loader import load_trading_sheet
 # sector_df = load_sector_map(sector_info_file)
 # print(sector_df)
 
+log = logging.getLogger(__name__)
+
+# default report location; created on first write, not at import
 OUT_DIR = Path("output")
-OUT_DIR.mkdir(exist_ok=True)
 
 PAGE_SIZE = (16.5, 11.7)
+
+# symbol summary column -> PDF table header
+PDF_COLUMNS = {
+    "sn": "SN",
+    "Current share Price": "Current Price",
+    "Buy share price": "Avg Buy Price",
+    "Investment_NPR": "Investment (NPR)",
+    "Market_Value_NPR": "Market Value (NPR)",
+    "PL": "P/L (NPR)",
+}
+PDF_FORMATS = renamed_formats(SYMBOL_SUMMARY_FORMATS, PDF_COLUMNS)
+
+# symbol table layout: figure-fraction axes, rows per page, column widths
+TABLE_AXES = [0.04, 0.05, 0.92, 0.85]
+ROWS_PER_PAGE = 30
+COL_WIDTHS = [
+    0.035, 0.060, 0.065, 0.070,
+    0.075, 0.085, 0.085,
+    0.070, 0.060,
+    0.055,
+]
 # def get_price_date(price_file):
 #     try:
 #         # handle both string path + file-like objects
@@ -114,6 +141,8 @@ def draw_header(fig, used_date, total_inv, total_mv, total_realized):
 
 # ------------------------------------------------------------
 # TABLE HELPERS (your nice formatting!)
+# add_table is the original matplotlib-Table path, kept for comparison
+# (benchmarks/bench_table_render.py); reports use table_render.draw_table.
 # ------------------------------------------------------------
 def wrap_header(text: str) -> str:
     parts = text.split()
@@ -123,18 +152,6 @@ def wrap_header(text: str) -> str:
     return " ".join(parts[:mid]) + "\n" + " ".join(parts[mid:])
 
 
-def _plpct_to_float(x):
-    if x is None:
-        return None
-    s = str(x).strip().replace("%", "").replace(",", "")
-    if s == "":
-        return None
-    try:
-        return float(s) / 100
-    except:
-        return None
-
-
 def _mix_rgb(c0, c1, t: float):
     t = max(0.0, min(1.0, float(t)))
     return (
@@ -144,9 +161,13 @@ def _mix_rgb(c0, c1, t: float):
     )
 
 
-def add_table(ax, df: pd.DataFrame, max_abs_pct=0.50):
+def add_table(ax, df: pd.DataFrame, max_abs_pct=0.50, formats=None):
+    """Draw a numeric summary frame; ``formats`` turns columns into text."""
+
+    # colors come from the numbers, text from the formatters
+    pl_pct = pd.to_numeric(df["PL%"], errors="coerce") if "PL%" in df.columns else None
 
-    df = df.copy().fillna("")
+    df = format_frame(df, formats or {}).fillna("")
     wrapped_headers = [wrap_header(c) for c in df.columns]
 
     col_widths = [
@@ -183,16 +204,15 @@ def add_table(ax, df: pd.DataFrame, max_abs_pct=0.50):
         header_cell.set_height(header_cell.get_height() * 1.8)
 
     # PL% gradient
-    if "PL%" in df.columns:
-        pl_col = list(df.columns).index("PL%")
+    if pl_pct is not None:
         white = (1, 1, 1)
         green = (0.20, 0.70, 0.30)
         red = (0.85, 0.20, 0.20)
 
         for i in range(n_rows):
-            v = _plpct_to_float(df.iloc[i, pl_col])
+            v = pl_pct.iloc[i]
 
-            if v is None:
+            if pd.isna(v):
                 row_color = white
             else:
                 intensity = min(abs(v) / max_abs_pct, 1.0)
@@ -204,120 +224,220 @@ def add_table(ax, df: pd.DataFrame, max_abs_pct=0.50):
 
 
 # ------------------------------------------------------------
-# MAIN PDF BUILD
+# PAGE STREAMS
+# Each *_pages function is a generator yielding one finished figure at a
+# time; write_pages saves and closes it before the next one is drawn, so
+# only one page is ever alive regardless of portfolio size.
 # ------------------------------------------------------------
-def make_pdf_report(trading_file, price_file, sheet_name, price_col):
-    print("PDF RUN START")
-    print("DEBUG — type(trading_file):", type(trading_file))
-    print("DEBUG — type(price_file):", type(price_file))
+def write_pages(pdf, figures):
+    # the page generators time their own drawing (span "render")
+    for fig in figures:
+        with span("save"):
+            # fixed layouts, so no bbox_inches="tight" (it renders twice)
+            pdf.savefig(fig)
+        plt.close(fig)
 
-    # reset uploaded files (important)
-    if hasattr(trading_file, "seek"):
-        trading_file.seek(0)
 
-    if hasattr(price_file, "seek"):
-        price_file.seek(0)
+def table_pages(summary: pd.DataFrame, draw_title):
+    """Symbol-summary table split into ROWS_PER_PAGE-row pages."""
+    table = summary.rename(columns=PDF_COLUMNS)
 
-    if trading_file is None:
-        raise ValueError("No trading log uploaded")
+    # render-time text + colors, computed once for all pages
+    with span("format"):
+        cells = format_frame(table, PDF_FORMATS).fillna("").astype(str).to_numpy()
+        headers = [wrap_header(c) for c in table.columns]
+        row_colors = pl_row_colors(table["PL%"])
+    pages = page_slices(len(cells), ROWS_PER_PAGE)
 
-    if price_file is None:
-        raise ValueError("No price file uploaded")
+    for page_no, rows in enumerate(pages, start=1):
+        with span("render"):
+            fig = plt.figure(figsize=PAGE_SIZE)
 
-    # 1️⃣ trading log
-    df_port = load_trading_sheet(trading_file, sheet_name)
+            draw_title(fig)
+            if len(pages) > 1:
+                fig.text(0.96, 0.015, f"Page {page_no} / {len(pages)}",
+                         fontsize=10, ha="right", va="bottom")
 
-    # 2️⃣ price file
-    price_raw = load_price_file(price_file)
+            ax = fig.add_axes(TABLE_AXES)
+            draw_table(
+                ax, cells[rows], headers,
+                col_widths=COL_WIDTHS,
+                row_colors=row_colors[rows],
+                capacity=ROWS_PER_PAGE,
+            )
+        yield fig
 
-    # filename for fallback
-    filename = Path(str(price_file)).name
 
-    # -----------------------------
-    # Extract price date for header
-    # -----------------------------
-    try:
-        raw = price_raw.iloc[1, 1]
-        used_date = pd.to_datetime(raw, errors="coerce").strftime("%Y-%m-%d")
-    except Exception:
-        m = re.search(r"\d{4}-\d{2}-\d{2}", filename)
-        used_date = m.group(0) if m else "Unknown"
+def pie_pages(sector_raw: pd.DataFrame):
+    pie_input = sector_raw.copy()
 
-    # 3️⃣ sector map
-    ROOT = Path(__file__).resolve().parents[3]
+    if "Sector" not in pie_input.columns and "Label" in pie_input.columns:
+        pie_input["Sector"] = pie_input["Label"].str.replace(r"\s*\(.*\)", "", regex=True)
 
-    sector_info_file = ROOT / "data" / "Sector_info.csv"
+    # vector pie: a few KB per page and no raster in memory
+    with span("render"):
+        pie_fig = plot_sector_pie(pie_input, size=PAGE_SIZE)
+    yield pie_fig
+
+
+def draw_sector_header(fig, sector_row, used_date):
+    fig.text(
+        0.50, 0.975,
+        f"Sector: {sector_row['Sector']}",
+        fontsize=15, weight="bold",
+        color="navy",
+        ha="center", va="top"
+    )
 
-    sector_df = load_sector_map(sector_info_file)
+    alloc = sector_row["Allocation%"]
+    alloc_text = f"{alloc:.1%}" if pd.notnull(alloc) else "–"
+    fig.text(
+        0.50, 0.94,
+        f"Price date: {used_date}  |  "
+        f"Investment: NPR {sector_row['Investment_NPR']:,.0f}  |  "
+        f"Market Value: NPR {sector_row['Market_Value_NPR']:,.0f}  |  "
+        f"P/L: NPR {sector_row['PL']:,.0f}  |  "
+        f"Allocation: {alloc_text}",
+        fontsize=13,
+        weight="bold",
+        ha="center", va="top"
+    )
 
 
-    # 4️⃣ summaries
-    symbol_summary_open = build_symbol_summary_open(df_port, price_raw, sector_df)
-    sector_raw = build_sector_summary_raw(df_port, price_raw, sector_df)
+def sector_detail_pages(symbol_summary: pd.DataFrame, sector_raw: pd.DataFrame, used_date):
+    """One table section per sector, largest investment first."""
+    by_sector = symbol_summary.groupby("Sector", sort=False)
 
-    total_inv = float(sector_raw["Investment_NPR"].sum())
-    total_mv = float(sector_raw["Market_Value_NPR"].sum())
+    for _, sector_row in sector_raw.sort_values("Investment_NPR", ascending=False).iterrows():
+        if sector_row["Sector"] not in by_sector.groups:
+            continue
 
-    rp = realized_profit_by_symbol(df_port)
-    total_realized = float(rp["Realized_Profit_NPR"].sum()) if not rp.empty else 0.0
+        rows = by_sector.get_group(sector_row["Sector"]).copy()
+        rows["sn"] = range(1, len(rows) + 1)
 
-    symbol_summary_pdf = symbol_summary_open.rename(columns={
-        "sn": "SN",
-        "Current share Price": "Current Price",
-        "Buy share price": "Avg Buy Price",
-        "Investment_NPR": "Investment (NPR)",
-        "Market_Value_NPR": "Market Value (NPR)",
-        "PL": "P/L (NPR)",
-    })
+        def title(fig, sector_row=sector_row):
+            draw_sector_header(fig, sector_row, used_date)
 
-    out_pdf = OUT_DIR / "nepse_portfolio_report_latest.pdf"
+        yield from table_pages(rows, title)
 
-    with PdfPages(out_pdf) as pdf:
-        fig = plt.figure(figsize=PAGE_SIZE)
 
+# ------------------------------------------------------------
+# MAIN PDF BUILD
+# ------------------------------------------------------------
+def make_pdf_report(
+    trading_file=None,
+    price_file=None,
+    sheet_name="Keshav",
+    price_col="Last Updated Price",
+    *,
+    df_port=None,
+    price_df=None,
+    sector_df=None,
+    snapshot=None,
+    price_date=None,
+    out_path=None,
+    sector_pages=True,
+):
+    """Build the PDF report and return its path.
+
+    Inputs can be given as files (``trading_file``/``price_file``, parsed
+    here) or as what the caller already loaded -- the ``df_port``/
+    ``price_df``/``sector_df`` frames or a ready ``snapshot`` -- so the
+    Streamlit flow parses each upload only once.  ``out_path`` defaults to
+    output/nepse_portfolio_report_latest.pdf; it can also be a binary file
+    object (e.g. ``io.BytesIO``), which is written to and returned instead
+    of a path -- see ``make_pdf_buffer``.
+
+    Pages are rendered and written one at a time (see ``write_pages``):
+    the symbol table split into pages, the sector pie, then one detail
+    section per sector unless ``sector_pages`` is False.
+    """
+    log.info("PDF run start")
+    log.debug("trading_file: %s, price_file: %s", type(trading_file), type(price_file))
+
+    if snapshot is None:
+        # 1️⃣ trading log
+        if df_port is None:
+            if trading_file is None:
+                raise ValueError("No trading log uploaded")
+
+            # reset uploaded files (important)
+            if hasattr(trading_file, "seek"):
+                trading_file.seek(0)
+            with span("load/journal"):
+                df_port = load_trading_sheet(trading_file, sheet_name)
+
+        # 2️⃣ price file
+        if price_df is None:
+            if price_file is None:
+                raise ValueError("No price file uploaded")
+
+            if hasattr(price_file, "seek"):
+                price_file.seek(0)
+            with span("load/price"):
+                price_df = load_price_file(price_file)
+
+        # 3️⃣ sector map
+        if sector_df is None:
+            with span("load/sectors"):
+                sector_df = load_sector_map(SECTOR_INFO_FILE, workbook=trading_file)
+
+        # 4️⃣ summaries (normalized + merged once)
+        with span("merge"):
+            snapshot = PortfolioSnapshot(df_port, price_df, sector_df)
+
+    # price date for header
+    if price_date is None:
+        filename = short_name(getattr(price_file, "name", price_file or ""))
+        price_date = get_price_date(price_df, filename) if price_df is not None else "Unknown"
+    used_date = price_date
+
+    with span("aggregate"):
+        symbol_summary_open = snapshot.symbol_summary()
+        sector_raw = snapshot.sector_summary()
+        totals = snapshot.totals()
+
+    total_inv = totals["total_inv"]
+    total_mv = totals["total_mv"]
+    total_realized = totals["total_realized"]
+
+    if hasattr(out_path, "write"):
+        out_pdf = out_path
+    else:
+        out_pdf = Path(out_path) if out_path else OUT_DIR / "nepse_portfolio_report_latest.pdf"
+        out_pdf.parent.mkdir(parents=True, exist_ok=True)
+
+    def overview_title(fig):
         draw_header(fig, used_date, total_inv, total_mv, total_realized)
 
-        ax = fig.add_axes([0.02, 0.08, 0.98, 0.82])
-        ax.axis("off")
-        add_table(ax, symbol_summary_pdf)
+    with PdfPages(out_pdf) as pdf:
+        write_pages(pdf, table_pages(symbol_summary_open, overview_title))
+        write_pages(pdf, pie_pages(sector_raw))
+        if sector_pages:
+            write_pages(pdf, sector_detail_pages(symbol_summary_open, sector_raw, used_date))
 
-        pdf.savefig(fig, bbox_inches="tight")
-        plt.close(fig)
+    return out_pdf
 
-        # ---------- PAGE 2 ----------
-        pie_input = sector_raw.copy()
 
-        if "Sector" not in pie_input.columns and "Label" in pie_input.columns:
-            pie_input["Sector"] = pie_input["Label"].str.replace(r"\s*\(.*\)", "", regex=True)
+def make_pdf_buffer(*args, save_to=None, **kwargs) -> io.BytesIO:
+    """The report rendered in memory (rewound BytesIO), no disk round trip.
 
-        pie_fig = plot_sector_pie(pie_input)
-        pie_fig.set_size_inches(PAGE_SIZE)
+    Takes ``make_pdf_report``'s arguments.  ``save_to`` optionally also
+    writes the finished PDF to that path (replaced atomically, so readers
+    never see a half-written file).
+    """
+    buf = io.BytesIO()
+    make_pdf_report(*args, out_path=buf, **kwargs)
 
-        pdf.savefig(pie_fig, bbox_inches="tight")
-        plt.close(pie_fig)
+    if save_to is not None:
+        atomic_write(save_to, buf.getvalue())
+
+    buf.seek(0)
+    return buf
 
-    return out_pdf
 
 if __name__ == "__main__":
-    # ---- CHANGE THESE TO REAL FILE PATHS ----
-    trading_file = r"C:\Users\npt_e\Documents\MEGA\Nepse_portfoli\nepse-portfolio-report-app\data\trading_journal_template.xls"
-    price_file   = r"C:\Users\npt_e\Documents\MEGA\Nepse_portfoli\nepse-portfolio-report-app\data\Today's Price - 2025-12-25.csv"
-    #sector_info_file  = r"C:\Users\npt_e\Documents\MEGA\Nepse_portfoli\nepse-portfolio-report-app\data\Sector_info.csv"
-
-    sheet_name = "Keshav"
-    price_col  = "Last Updated Price"
-
-    try:
-        pdf_path = make_pdf_report(
-            trading_file=trading_file,
-            price_file=price_file,
-            sheet_name=sheet_name,
-            price_col=price_col,
-            
-        )
-
-        print("\nPDF created successfully:\n", pdf_path)
-
-    except Exception as e:
-        print("\nFAILED while generating PDF:\n")
-        print(e)
+    # kept for old scripts; the CLI lives in nepse_portfoli.app.cli
+    from nepse_portfoli.app.cli import main
+
+    raise SystemExit(main())
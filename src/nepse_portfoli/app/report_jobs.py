@@ -0,0 +1,214 @@
+# background PDF jobs for the Streamlit app
+#
+# The app used to render inside the button handler (the session froze for
+# the whole render) and every run wrote output/nepse_portfolio_report_latest.pdf,
+# so two users generating at once overwrote each other's report.  Instead
+# the app submits a job and polls it:
+#
+#   queue = ReportQueue()
+#   job_id = queue.submit(snapshot, price_date, journal=..., price=..., sheet="Keshav")
+#   queue.status(job_id)   # {"state": "queued" | "running" | "done" | "failed", ...}
+#
+# The session has already parsed and merged its inputs into a
+# PortfolioSnapshot, so that is what the job carries: the worker only
+# renders.  A job's id is a hash of everything that shapes the PDF (journal
+# and price file digests, sheet, sector CSV, options), so identical
+# requests -- e.g. many users on the default journal and today's prices --
+# render once and share the result.  Finished PDFs are kept in memory (status()["pdf"]); with an
+# ``out_dir`` they are also written to <out_dir>/<job id>.pdf, which then
+# serves identical requests across restarts.  Jobs run in a bounded
+# process pool like app/batch.py (rendering is CPU-bound and holds the
+# GIL); workers are spawned, not forked, since the Streamlit server is
+# multi-threaded.
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from pathlib import Path
+
+from nepse_portfoli.app.batch import _init_worker
+from nepse_portfoli.config.paths import ROOT, SECTOR_INFO_FILE
+from nepse_portfoli.io.parsed_cache import file_digest
+
+
+# suggested ``out_dir`` when reports should also land on disk
+JOBS_DIR = ROOT / "output" / "jobs"
+
+# bump when the rendered PDF changes for the same inputs
+JOB_KIND = "report/v1"
+
+WORKERS = int(os.environ.get("NEPSE_REPORT_WORKERS", 2))
+# jobs waiting or running before submit() refuses more
+MAX_PENDING = 32
+# finished PDFs kept (in memory, and in out_dir); oldest dropped first
+MAX_KEPT = 50
+
+PENDING = ("queued", "running")
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+def job_key(journal, price, sheet: str, sector_file=SECTOR_INFO_FILE, **options) -> str:
+    """Hash of what shapes the PDF; ``journal``/``price`` are paths or file objects."""
+    raw = json.dumps([
+        JOB_KIND,
+        file_digest(journal),
+        file_digest(price),
+        sheet,
+        file_digest(sector_file),
+        options,
+    ], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+
+def _render_job(job: dict) -> dict:
+    """Worker side: render the job's snapshot to a PDF."""
+    from nepse_portfoli.app.make_report_pdf import make_pdf_buffer
+    from nepse_portfoli.core.profiling import Profiler
+
+    t0 = time.perf_counter()
+    profiler = Profiler(f"job {job['id']}", memory=True) if job["profile"] else nullcontext()
+    with profiler:
+        pdf = make_pdf_buffer(
+            snapshot=job["snapshot"],
+            price_date=job["price_date"],
+            sector_pages=job["sector_pages"],
+            save_to=job["out_path"],
+        )
+
+    return {
+        "pdf": pdf.getvalue(),
+        "seconds": time.perf_counter() - t0,
+        "timings": profiler.report() if job["profile"] else None,
+    }
+
+
+class ReportQueue:
+    def __init__(self, out_dir=None, workers=WORKERS, max_pending=MAX_PENDING, max_kept=MAX_KEPT):
+        self.out_dir = Path(out_dir) if out_dir is not None else None
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_kept = max_kept
+
+        # RLock: a done-callback can fire inside submit() when a job fails fast
+        self._lock = threading.RLock()
+        self._jobs = {}   # job id -> {"future", "submitted", "sheet", "price_date"}
+        self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._pool
+
+    def path(self, job_id: str):
+        """Where the job's PDF is written; None without an out_dir."""
+        return self.out_dir / f"{job_id}.pdf" if self.out_dir is not None else None
+
+    def submit(
+        self, snapshot, price_date, *, journal, price, sheet="Keshav",
+        sector_pages=True, profile=False,
+    ) -> str:
+        """Queue a report of ``snapshot`` (or join an identical one); returns the job id.
+
+        ``journal``/``price`` (paths or uploads) are only hashed for the job
+        id; the worker renders the snapshot as is.  ``profile`` adds a
+        stage-timing report to the job's status.
+        """
+        job_id = job_key(journal, price, sheet, sector_pages=sector_pages)
+
+        with self._lock:
+            # pending, or already rendered (possibly by an earlier run)
+            if self._state(job_id, self._jobs.get(job_id)) in PENDING + ("done",):
+                return job_id
+
+            pending = sum(self._state(i, j) in PENDING for i, j in self._jobs.items())
+            if pending >= self.max_pending:
+                raise QueueFull(f"{pending} reports are already waiting; try again shortly")
+
+            path = self.path(job_id)
+            job = {
+                "id": job_id,
+                "snapshot": snapshot,
+                "price_date": price_date,
+                "sector_pages": sector_pages,
+                "profile": profile,
+                "out_path": str(path) if path is not None else None,
+            }
+            try:
+                future = self._executor().submit(_render_job, job)
+            except BrokenProcessPool:
+                # a worker died (e.g. out of memory); start a fresh pool
+                self._pool = None
+                future = self._executor().submit(_render_job, job)
+            future.add_done_callback(lambda _: self._prune())
+            self._jobs[job_id] = {
+                "future": future,
+                "submitted": time.time(),
+                "sheet": sheet,
+                "price_date": price_date,
+            }
+        return job_id
+
+    def _state(self, job_id, job) -> str:
+        if job is not None:
+            future = job["future"]
+            if not future.done():
+                return "running" if future.running() else "queued"
+            if future.exception() is not None:
+                return "failed"
+            return "done"
+        # not in memory (pruned, or from an earlier run): only the disk copy
+        path = self.path(job_id)
+        return "done" if path is not None and path.exists() else "unknown"
+
+    def status(self, job_id: str) -> dict:
+        """state, pdf bytes and path (when done), error (when failed), seconds, timings."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            state = self._state(job_id, job)
+
+        out = {"id": job_id, "state": state, "pdf": None, "path": None, "error": None,
+               "seconds": None, "timings": None, "waited": None}
+        if job is not None:
+            out["waited"] = time.time() - job["submitted"]
+        if state == "failed":
+            e = job["future"].exception()
+            out["error"] = f"{type(e).__name__}: {e}"
+        elif state == "done":
+            path = self.path(job_id)
+            if path is not None and path.exists():
+                out["path"] = path
+            if job is not None:
+                out.update(job["future"].result())
+            else:
+                out["pdf"] = path.read_bytes()
+        return out
+
+    def _prune(self) -> None:
+        with self._lock:
+            finished = [i for i, j in self._jobs.items() if j["future"].done()]
+            for job_id in finished[:max(0, len(finished) - self.max_kept)]:
+                del self._jobs[job_id]
+
+            if self.out_dir is None:
+                return
+            pdfs = sorted(self.out_dir.glob("*.pdf"), key=lambda p: p.stat().st_mtime)
+            for old in pdfs[:max(0, len(pdfs) - self.max_kept)]:
+                if old.stem not in self._jobs:
+                    old.unlink(missing_ok=True)
+
+    def shutdown(self, wait=True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
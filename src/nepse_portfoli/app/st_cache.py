@@ -0,0 +1,76 @@
+# Streamlit caching layer for app.py
+#
+# Streamlit re-runs the whole script on every widget interaction; without
+# these wrappers each rerun re-downloaded the defaults and each click
+# recomputed every summary.  (The sector map is memoized process-wide by
+# io/sector_registry.py.)
+from pathlib import Path
+
+import streamlit as st
+
+from nepse_portfoli.app.report_jobs import ReportQueue
+from nepse_portfoli.core.profiling import span
+from nepse_portfoli.core.snapshot import PortfolioSnapshot
+from nepse_portfoli.core.summary_pi import load_sector_map
+from nepse_portfoli.io.parsed_cache import file_digest
+from nepse_portfoli.io.read_price_file import load_price_file, get_price_date
+from nepse_portfoli.io.trading_loader import load_trading_sheet
+from nepse_portfoli.io.data_sources import resolve_source
+
+
+# remote defaults change rarely; refetch a few times a day at most
+REMOTE_TTL = 6 * 60 * 60
+
+
+@st.cache_data(ttl=REMOTE_TTL, show_spinner=False)
+def fetch_bytes(url: str) -> bytes:
+    return resolve_source(url).read_bytes()
+
+
+@st.cache_data(ttl=REMOTE_TTL, show_spinner=False)
+def default_source(url: str) -> str:
+    """Local path of a default file: data/ copy, else the HTTP cache."""
+    return str(resolve_source(url))
+
+
+@st.cache_resource(max_entries=16, ttl=REMOTE_TTL, show_spinner=False)
+def _snapshot(
+    trading_digest, price_digest, sheet_name, sector_file, sector_mtime,
+    _trading_source, _price_source, _price_name,
+):
+    # underscore args are not hashed: the digests above are the cache key
+    with span("load/journal"):
+        port_df = load_trading_sheet(_trading_source, sheet_name)
+    with span("load/price"):
+        price_df = load_price_file(_price_source)
+    # the registry re-reads the CSV only when it changes on disk
+    with span("load/sectors"):
+        sector_df = load_sector_map(sector_file, workbook=_trading_source)
+
+    with span("merge"):
+        snapshot = PortfolioSnapshot(port_df, price_df, sector_df)
+    return snapshot, get_price_date(price_df, _price_name)
+
+
+def portfolio_snapshot(trading_source, price_source, price_name, sheet_name, sector_file):
+    """(snapshot, price_date) for the given inputs, shared across reruns.
+
+    Keyed by the content hash of both files, so the same uploads reuse the
+    computed summaries while a changed file gets a fresh snapshot.
+    """
+    return _snapshot(
+        file_digest(trading_source),
+        file_digest(price_source),
+        sheet_name,
+        str(sector_file),
+        Path(sector_file).stat().st_mtime,
+        trading_source,
+        price_source,
+        price_name,
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def report_queue() -> ReportQueue:
+    """One job queue per server process, shared by every session."""
+    return ReportQueue()
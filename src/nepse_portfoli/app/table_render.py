@@ -0,0 +1,106 @@
+# fast table rendering for the PDF report
+#
+# matplotlib's ax.table() lays out every cell as its own Rectangle + Text
+# and re-measures them on each draw; styling then walks every cell again.
+# Here the row fills are one PolyCollection with a precomputed color array,
+# the grid is one LineCollection, and only the cell texts are per-cell
+# artists.  Row height is fixed, so a page holds a known number of rows and
+# long tables are split across pages instead of being squeezed.
+import numpy as np
+import pandas as pd
+from matplotlib.collections import LineCollection, PolyCollection
+
+
+WHITE = np.array([1.0, 1.0, 1.0])
+GREEN = np.array([0.20, 0.70, 0.30])
+RED = np.array([0.85, 0.20, 0.20])
+HEADER_COLOR = (0.94, 0.94, 0.94)
+
+
+def pl_row_colors(pl_pct, max_abs_pct=0.50) -> np.ndarray:
+    """(n, 3) RGB per row: white -> green for gains, white -> red for losses."""
+    v = pd.to_numeric(pd.Series(pl_pct), errors="coerce").to_numpy(dtype=float)
+    t = np.clip(np.abs(v) / max_abs_pct, 0.0, 1.0)
+
+    target = np.where((v >= 0)[:, None], GREEN, RED)
+    colors = WHITE + (target - WHITE) * t[:, None]
+    colors[np.isnan(v)] = WHITE
+    return colors
+
+
+def page_slices(n_rows: int, rows_per_page: int) -> list:
+    """Row slices, one per page (an empty table still gets one page)."""
+    starts = range(0, max(n_rows, 1), rows_per_page)
+    return [slice(s, s + rows_per_page) for s in starts]
+
+
+def _boxes(x0, x1, y0, y1) -> np.ndarray:
+    """(n, 4, 2) rectangle vertices from per-box edges."""
+    return np.stack([
+        np.stack([x0, y0], axis=-1),
+        np.stack([x1, y0], axis=-1),
+        np.stack([x1, y1], axis=-1),
+        np.stack([x0, y1], axis=-1),
+    ], axis=1)
+
+
+def draw_table(
+    ax,
+    cells,
+    headers,
+    col_widths=None,
+    row_colors=None,
+    capacity=None,
+    fontsize=11,
+    header_height=1.8,
+):
+    """Draw a text table into ``ax``.
+
+    ``cells`` is an (n_rows, n_cols) array of strings, ``row_colors`` an
+    optional (n_rows, 3) RGB array.  Rows are one data unit tall and the
+    y-axis spans ``capacity`` rows, so a short last page keeps the same
+    row height as the full ones.
+    """
+    cells = np.asarray(cells, dtype=object).reshape(-1, len(headers))
+    n_rows, n_cols = cells.shape
+    capacity = max(capacity or n_rows, n_rows, 1)
+
+    widths = np.asarray(col_widths if col_widths is not None else np.ones(n_cols), dtype=float)
+    widths = widths[:n_cols] / widths[:n_cols].sum()
+    x = np.concatenate([[0.0], np.cumsum(widths)])
+    bottom = header_height + n_rows
+
+    # backgrounds: header + every row in a single collection
+    rows = np.arange(n_rows, dtype=float)
+    verts = _boxes(
+        np.zeros(n_rows + 1),
+        np.ones(n_rows + 1),
+        np.concatenate([[0.0], header_height + rows]),
+        np.concatenate([[header_height], header_height + rows + 1]),
+    )
+    if row_colors is None:
+        row_colors = np.tile(WHITE, (n_rows, 1))
+    face = np.vstack([HEADER_COLOR, np.asarray(row_colors, dtype=float).reshape(-1, 3)])
+    ax.add_collection(PolyCollection(verts, facecolors=face, edgecolors="none"))
+
+    # grid
+    ys = np.concatenate([[0.0], header_height + np.arange(n_rows + 1)])
+    segments = [[(0.0, y), (1.0, y)] for y in ys]
+    segments += [[(xi, 0.0), (xi, bottom)] for xi in x]
+    ax.add_collection(LineCollection(segments, colors="black", linewidths=0.8))
+
+    # text (cells sit inside the axes, so skip the per-artist clip path)
+    cx = (x[:-1] + x[1:]) / 2
+    for c, label in enumerate(headers):
+        ax.text(cx[c], header_height / 2, label, ha="center", va="center",
+                fontsize=fontsize, weight="bold", clip_on=False)
+
+    for r in range(n_rows):
+        y = header_height + r + 0.5
+        for c in range(n_cols):
+            ax.text(cx[c], y, cells[r, c], ha="center", va="center",
+                    fontsize=fontsize, clip_on=False)
+
+    ax.set_xlim(0, 1)
+    ax.set_ylim(header_height + capacity, 0)
+    ax.axis("off")
@@ -0,0 +1,11 @@
+# project paths shared by io/app modules
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+
+DATA_DIR = ROOT / "data"
+SECTOR_INFO_FILE = DATA_DIR / "Sector_info.csv"
+
+# parsed-file / download caches; override with NEPSE_CACHE_DIR
+CACHE_DIR = Path(os.environ.get("NEPSE_CACHE_DIR", ROOT / ".cache"))
@@ -0,0 +1,95 @@
+# rendered-chart cache for the Streamlit app
+#
+# The sector pie depends only on the sector allocation, so the rendered
+# bytes are keyed by a hash of the (Sector, Investment_NPR) vector plus the
+# output format, size and DPI.  The app reruns its script on every
+# interaction; with the on-disk store a pie is drawn once per allocation
+# instead of on every rerun, and is shared across sessions and restarts.
+#
+# The PDF report does not use it: its pie page is drawn as vectors
+# (a raster at print DPI cost hundreds of MB and ten times the page size).
+# Entries are evicted oldest-first past MAX_BYTES / MAX_ENTRIES (io/disk_lru.py).
+import hashlib
+import io
+import json
+import threading
+
+import pandas as pd
+
+from nepse_portfoli.config.paths import CACHE_DIR
+from nepse_portfoli.io.disk_lru import DiskLRU
+from nepse_portfoli.core.summary_pi import plot_sector_pie, sector_allocation
+
+
+# bump when plot_sector_pie draws differently
+PIE_KIND = "sector_pie/v1"
+
+FORMATS = ("png", "svg", "pdf")
+SCREEN_DPI = 144
+
+MAX_BYTES = 64 * 1024 * 1024
+MAX_ENTRIES = 256
+
+
+def allocation_key(sector_raw: pd.DataFrame, **params) -> str:
+    """Hash of the pie's allocation vector and render ``params``."""
+    alloc = sector_allocation(sector_raw)
+    vector = list(zip(alloc["Sector"], alloc["Investment_NPR"].round(2)))
+    raw = json.dumps([PIE_KIND, vector, params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ChartCache(DiskLRU):
+    """On-disk LRU of rendered chart bytes, bounded by bytes and entry count."""
+
+    suffixes = tuple(f".{fmt}" for fmt in FORMATS)
+
+    def __init__(self, root=CACHE_DIR / "charts", max_bytes=MAX_BYTES, max_entries=MAX_ENTRIES):
+        super().__init__(root, max_bytes, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, fmt: str):
+        return self.read(f"{key}.{fmt}")
+
+    def put(self, key: str, fmt: str, data: bytes) -> None:
+        self.write(f"{key}.{fmt}", data)
+
+    def sector_pie(self, sector_raw: pd.DataFrame, fmt="png", size=(6, 6), dpi=SCREEN_DPI) -> bytes:
+        """The sector pie as ``fmt`` bytes, rendered only on a cache miss.
+
+        ``size`` is in inches; ``dpi`` only matters for png.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+        if fmt != "png":
+            dpi = None  # vector output: keep one entry per size
+
+        key = allocation_key(sector_raw, fmt=fmt, size=list(size), dpi=dpi)
+        data = self.get(key, fmt)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        # pyplot state is global; one render at a time per process
+        with self._lock:
+            import matplotlib.pyplot as plt
+
+            fig = plot_sector_pie(sector_raw, size=size)
+            buf = io.BytesIO()
+            try:
+                fig.savefig(buf, format=fmt, dpi=dpi or "figure")
+            finally:
+                plt.close(fig)
+        data = buf.getvalue()
+        self.misses += 1
+
+        try:
+            self.put(key, fmt, data)
+        except OSError:
+            pass  # read-only / full disk: caching is best effort
+        return data
+
+
+chart_cache = ChartCache()
@@ -0,0 +1,61 @@
+# presentation formatting for the numeric summary frames
+#
+# Core builders return plain float/int columns; text only gets produced
+# here, at render time (PDF table, exports meant for people).  A format
+# is any callable Series -> Series of str, so callers can plug their own.
+import pandas as pd
+
+
+def fmt_int(s: pd.Series) -> pd.Series:
+    """1234.6 -> "1,235"; missing -> ""."""
+    # + 0.0 turns -0.0 into 0.0 so small losses don't print as "-0"
+    v = pd.to_numeric(s, errors="coerce").round() + 0.0
+    return v.map("{:,.0f}".format, na_action="ignore").fillna("")
+
+
+def fmt_pct(s: pd.Series) -> pd.Series:
+    """0.1234 -> "12.34%"; missing -> ""."""
+    v = pd.to_numeric(s, errors="coerce") * 100
+    return v.map("{:.2f}%".format, na_action="ignore").fillna("")
+
+
+SYMBOL_SUMMARY_FORMATS = {
+    "Total Kitta": fmt_int,
+    "Current share Price": fmt_int,
+    "Buy share price": fmt_int,
+    "Investment_NPR": fmt_int,
+    "Market_Value_NPR": fmt_int,
+    "PL": fmt_int,
+    "PL%": fmt_pct,
+}
+
+SECTOR_SUMMARY_FORMATS = {
+    "Total_Kitta": fmt_int,
+    "Investment_NPR": fmt_int,
+    "Market_Value_NPR": fmt_int,
+    "PL": fmt_int,
+    "PL%": fmt_pct,
+    "Allocation%": fmt_pct,
+}
+
+REALIZED_FORMATS = {
+    "Realized_Profit_NPR": fmt_int,
+}
+
+
+def renamed_formats(formats: dict, columns: dict) -> dict:
+    """Re-key ``formats`` after a ``DataFrame.rename(columns=columns)``."""
+    return {columns.get(col, col): fmt for col, fmt in formats.items()}
+
+
+def format_frame(df: pd.DataFrame, formats: dict) -> pd.DataFrame:
+    """Copy of ``df`` with every column in ``formats`` rendered as text."""
+    out = df.copy()
+    for col, fmt in formats.items():
+        if col in out.columns:
+            out[col] = fmt(out[col])
+    return out
+
+
+def format_symbol_summary(summary: pd.DataFrame) -> pd.DataFrame:
+    return format_frame(summary, SYMBOL_SUMMARY_FORMATS)
@@ -0,0 +1,210 @@
+# incremental portfolio summaries across runs
+#
+# A nightly report sees the same journal every day plus a handful of new
+# rows.  Each journal row is hashed; a symbol's fingerprint is the sum of
+# its rows' hashes, so appending, editing or deleting any of its lots
+# changes it.  The per-symbol aggregates from the previous run are stored
+# together with the fingerprint, price and sector they were computed from,
+# and only symbols where one of those changed are re-aggregated (through
+# PortfolioSnapshot on just their rows).  Hashing is one vectorized pass;
+# the normalize/price/group work is proportional to the changed symbols.
+#
+# State lives in CACHE_DIR/incremental/, one pickle per (journal, sheet).
+import hashlib
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nepse_portfoli.config.paths import CACHE_DIR
+from nepse_portfoli.io.atomic import atomic_write
+from nepse_portfoli.core.snapshot import (
+    PortfolioSnapshot,
+    _detect_price_column,
+    aggregate_symbols,
+    finish_symbol_summary,
+    normalize_symbol,
+    portfolio_totals,
+    summarize_sectors,
+    to_number,
+)
+from nepse_portfoli.core.symbols import SymbolIndex
+
+
+STATE_DIR = CACHE_DIR / "incremental"
+# bump when the aggregates or the fingerprint change meaning
+STATE_VERSION = 1
+
+# the journal columns PortfolioSnapshot reads; others do not affect results
+JOURNAL_COLUMNS = [
+    "Symbol",
+    "position",
+    "Buy price",
+    "Sell price",
+    "Total holding",
+    "Open date",
+    "Closed date",
+]
+
+# per-symbol state, indexed by normalized symbol
+STATE_COLUMNS = [
+    "fingerprint",
+    "price",
+    "sector",
+    "has_open",
+    "Total Kitta",
+    "Investment_NPR",
+    "Market_Value_NPR",
+    "Sector",
+    "Realized_Profit_NPR",
+]
+
+
+def row_fingerprints(journal: pd.DataFrame) -> np.ndarray:
+    """uint64 hash per journal row over the columns that feed the summaries."""
+    cols = [c for c in JOURNAL_COLUMNS if c in journal.columns]
+    return pd.util.hash_pandas_object(journal[cols].astype(str), index=False).to_numpy()
+
+
+def symbol_fingerprints(symbols: pd.Series, hashes: np.ndarray) -> pd.Series:
+    """Order-independent fingerprint per symbol (wrapping sum of row hashes)."""
+    codes, uniques = pd.factorize(symbols, sort=True)
+    fp = np.zeros(len(uniques), dtype="uint64")
+    np.add.at(fp, codes, hashes)
+    # hex text: survives reindexing against stored state (uint64 would go float)
+    return pd.Series([f"{v:016x}" for v in fp], index=pd.Index(uniques, name="Symbol"))
+
+
+def _same(a: pd.Series, b: pd.Series) -> pd.Series:
+    """Elementwise equality where NaN == NaN."""
+    return (a == b) | (a.isna() & b.isna())
+
+
+class PortfolioSummaries:
+    """The summary views of a PortfolioSnapshot, assembled from cached
+    per-symbol aggregates (no ``lots``).  Accepted by ``make_pdf_report``.
+    """
+
+    def __init__(self, state: pd.DataFrame, recomputed: list):
+        self.state = state
+        self.recomputed = recomputed
+
+    def symbol_summary(self) -> pd.DataFrame:
+        held = self.state[self.state["has_open"]].reset_index()
+        return finish_symbol_summary(
+            held[["Symbol", "Total Kitta", "Investment_NPR", "Market_Value_NPR", "Sector"]]
+        )
+
+    def sector_summary(self) -> pd.DataFrame:
+        held = self.state[self.state["has_open"]]
+        return summarize_sectors(held, kitta_col="Total Kitta")
+
+    def realized_summary(self) -> pd.DataFrame:
+        realized = self.state["Realized_Profit_NPR"].dropna()
+        return (
+            realized.rename_axis("Symbol").reset_index()
+            .sort_values("Realized_Profit_NPR", ascending=False)
+        )
+
+    def totals(self) -> dict:
+        return portfolio_totals(self.sector_summary(), self.realized_summary())
+
+
+class IncrementalPortfolio:
+    """Keeps the per-symbol aggregates of one journal between runs."""
+
+    def __init__(self, name: str, root=STATE_DIR, realized_method: str = None):
+        self.root = Path(root)
+        self.realized_method = realized_method
+        key = f"{name}::{realized_method or 'journal'}"
+        self.path = self.root / f"{hashlib.sha256(key.encode()).hexdigest()[:24]}.pkl"
+
+    @classmethod
+    def for_journal(cls, journal_path, sheet: str, root=STATE_DIR, realized_method: str = None):
+        return cls(f"{Path(journal_path).resolve()}::{sheet}", root=root,
+                   realized_method=realized_method)
+
+    # ------------------------------------------------------------
+    # STATE FILE
+    # ------------------------------------------------------------
+    def load_state(self) -> pd.DataFrame:
+        try:
+            with open(self.path, "rb") as f:
+                saved = pickle.load(f)
+            if saved.get("version") == STATE_VERSION:
+                return saved["symbols"]
+        except FileNotFoundError:
+            pass
+        except Exception:
+            self.path.unlink(missing_ok=True)  # unreadable: start over
+        return pd.DataFrame(columns=STATE_COLUMNS, index=pd.Index([], name="Symbol"))
+
+    def save_state(self, state: pd.DataFrame) -> None:
+        atomic_write(self.path, lambda f: pickle.dump(
+            {"version": STATE_VERSION, "symbols": state}, f, protocol=pickle.HIGHEST_PROTOCOL,
+        ))
+
+    def reset(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------
+    # UPDATE
+    # ------------------------------------------------------------
+    def update(
+        self,
+        journal: pd.DataFrame,
+        price_df: pd.DataFrame = None,
+        sector_df: pd.DataFrame = None,
+        save=True,
+    ) -> PortfolioSummaries:
+        """Summaries for ``journal``, re-aggregating only changed symbols."""
+        symbols = normalize_symbol(journal["Symbol"])
+        fp = symbol_fingerprints(symbols, row_fingerprints(journal))
+
+        index = SymbolIndex(fp.index, canonical=True)  # fp.index is sorted, so codes follow it
+        if price_df is not None:
+            prices = index.align(price_df, to_number(price_df[_detect_price_column(price_df)]))
+        else:
+            prices = np.full(len(index), np.nan)
+        price = pd.Series(prices, index=fp.index)
+
+        if sector_df is not None:
+            sector = pd.Series(index.align(sector_df, sector_df["Sector"]), index=fp.index)
+        else:
+            sector = pd.Series(None, index=fp.index, dtype=object)
+
+        saved = self.load_state()
+        old = saved.reindex(fp.index)  # drops symbols no longer in the journal
+        changed = ~(
+            (old["fingerprint"] == fp)
+            & _same(old["price"], price)
+            & _same(old["sector"], sector)
+        )
+        todo = fp.index[changed.to_numpy()]
+
+        state = old
+        if len(todo) or len(saved) != len(old):
+            snapshot = PortfolioSnapshot(
+                journal[symbols.isin(todo).to_numpy()], price_df, sector_df,
+                realized_method=self.realized_method,
+            )
+            opened = aggregate_symbols(snapshot.open_lots).set_index("Symbol")
+            realized = snapshot.realized_summary().set_index("Symbol")["Realized_Profit_NPR"]
+
+            fresh = pd.DataFrame(index=todo)
+            fresh["fingerprint"] = fp[todo]
+            fresh["price"] = price[todo]
+            fresh["sector"] = sector[todo]
+            fresh["has_open"] = fresh.index.isin(opened.index)
+            fresh = fresh.join(opened[["Total Kitta", "Investment_NPR", "Market_Value_NPR", "Sector"]])
+            fresh["Realized_Profit_NPR"] = realized.reindex(todo)
+
+            state = pd.concat([old[~changed], fresh[STATE_COLUMNS]]).sort_index()
+            state.index.name = "Symbol"
+            state["has_open"] = state["has_open"].astype(bool)
+
+            if save:
+                self.save_state(state)
+
+        return PortfolioSummaries(state, list(todo))
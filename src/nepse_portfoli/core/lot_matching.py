@@ -0,0 +1,220 @@
+# realized / unrealized P&L by matching sells against buy lots
+#
+# The journal records every purchase as a row (Open date, Buy price, Total
+# holding); a row marked "c" was later sold at Sell price on Closed date.
+# PortfolioSnapshot's default realized view prices each sale against its
+# own row.  Here buys and sells are separate event streams per symbol
+# instead, so a sale can consume several lots or part of one:
+#
+#   fifo     sells consume the oldest shares first.  With buys sorted by
+#            (symbol, open date) the cumulative cost is a piecewise-linear
+#            function of cumulative quantity, so the cost of the k-th sale
+#            is C(sold up to k) - C(sold before k), one np.interp lookup
+#            each -- O(n log n) for the whole journal, no Python loop.
+#   average  sells are charged the running weighted-average cost.  That is
+#            a recurrence (the average after a sale depends on what was
+#            held), so it is one pass over the sorted events.
+#
+# Selling more of a symbol than was ever bought leaves the excess as
+# Unmatched_Kitta, which is kept out of realized P&L.
+import numpy as np
+import pandas as pd
+
+
+METHODS = ("fifo", "average")
+
+_T_MIN = np.iinfo("int64").min
+_T_MAX = np.iinfo("int64").max
+
+
+class LotMatch:
+    """Result of ``match_lots``.
+
+    by_symbol  Symbol, Bought_Kitta, Sold_Kitta, Held_Kitta, Unmatched_Kitta,
+               Cost_Basis_NPR (of the held shares), Avg_Cost, Price,
+               Realized_PL, Unrealized_PL
+    by_lot     one row per journal lot (index kept): the sale on that row
+               (Matched_Cost per share, Realized_PL) and what is left of the
+               lot as a buy (Remaining_Kitta, Remaining_Cost per share,
+               Unrealized_PL)
+    """
+
+    def __init__(self, method, by_symbol, by_lot):
+        self.method = method
+        self.by_symbol = by_symbol
+        self.by_lot = by_lot
+
+    def realized_summary(self) -> pd.DataFrame:
+        """Same shape as PortfolioSnapshot.realized_summary()."""
+        sold = self.by_symbol[self.by_symbol["Sold_Kitta"] > 0]
+        return (
+            sold[["Symbol", "Realized_PL"]]
+            .rename(columns={"Realized_PL": "Realized_Profit_NPR"})
+            .sort_values("Realized_Profit_NPR", ascending=False)
+            .reset_index(drop=True)
+        )
+
+
+def _times(dates: pd.Series, missing) -> np.ndarray:
+    t = dates.to_numpy(dtype="datetime64[ns]").view("int64").copy()
+    t[pd.isna(dates).to_numpy()] = missing
+    return t
+
+
+def _segment_cumsum(values: np.ndarray, codes: np.ndarray, n_groups: int):
+    """Running sum restarting at each group (values sorted by group).
+
+    Returns (within-group cumsum, group totals, global offset of each group).
+    """
+    total = np.cumsum(values)
+    group_total = np.bincount(codes, weights=values, minlength=n_groups)
+    offset = np.concatenate([[0.0], np.cumsum(group_total)[:-1]])
+    return total - offset[codes], group_total, offset
+
+
+def match_lots(lots: pd.DataFrame, method="fifo") -> LotMatch:
+    """Match sells to buys in ``lots`` (PortfolioSnapshot.lots)."""
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+
+    lots = lots[lots["has_symbol"] & lots["position"].isin(["o", "c"])]
+    lots = lots.dropna(subset=["Buy price", "Total holding"])
+    lots = lots[lots["Total holding"] > 0]
+
+    n = len(lots)
+    code, symbols = pd.factorize(lots["Symbol"], sort=True)
+    n_sym = len(symbols)
+    rows = np.arange(n)
+
+    qty = lots["Total holding"].to_numpy(dtype=float)
+    buy_px = lots["Buy price"].to_numpy(dtype=float)
+    sell_px = lots["Sell price"].to_numpy(dtype=float)
+    is_sell = (lots["position"] == "c").to_numpy() & ~np.isnan(sell_px)
+
+    open_t = _times(lots["Open date"], _T_MIN)
+    close_t = _times(lots["Closed date"], _T_MAX)
+
+    # ---- buys sorted by (symbol, open date, row) ----
+    b = np.lexsort((rows, open_t, code))
+    b_code = code[b]
+    b_cum_qty, bought, b_offset = _segment_cumsum(qty[b], b_code, n_sym)
+    b_cost = qty[b] * buy_px[b]
+    b_cum_cost, _, b_cost_offset = _segment_cumsum(b_cost, b_code, n_sym)
+
+    # ---- sells sorted by (symbol, close date, row) ----
+    s_rows = np.flatnonzero(is_sell)
+    s = s_rows[np.lexsort((s_rows, close_t[s_rows], code[s_rows]))]
+    s_code = code[s]
+    s_cum, sold, _ = _segment_cumsum(qty[s], s_code, n_sym)
+
+    # matched part of each sale: what had been bought in total covers it
+    upto = np.minimum(s_cum, bought[s_code])
+    before = np.minimum(s_cum - qty[s], bought[s_code])
+    matched = upto - before
+
+    realized = np.zeros(n)
+    matched_cost = np.full(n, np.nan)
+
+    if method == "fifo":
+        # global cost curve over all symbols' buys laid end to end
+        xp = np.concatenate([[0.0], b_offset[b_code] + b_cum_qty])
+        fp = np.concatenate([[0.0], b_cost_offset[b_code] + b_cum_cost])
+
+        def cost_at(x, c):
+            return np.interp(b_offset[c] + x, xp, fp) - b_cost_offset[c]
+
+        sale_cost = cost_at(upto, s_code) - cost_at(before, s_code)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matched_cost[s] = sale_cost / matched
+        realized[s] = sell_px[s] * matched - sale_cost
+    else:
+        # one pass over buys + sells in time order; buys first on a tie
+        ev_row = np.concatenate([b, s])
+        ev_sell = np.concatenate([np.zeros(len(b), bool), np.ones(len(s), bool)])
+        ev_time = np.where(ev_sell, close_t[ev_row], open_t[ev_row])
+        order = np.lexsort((ev_row, ev_sell, ev_time, code[ev_row]))
+
+        sale_matched = np.zeros(n)
+        sale_matched[s] = matched
+        ev_row = ev_row[order]
+
+        # plain Python floats: per-element numpy indexing dominates otherwise
+        held = cost = 0.0
+        current = -1
+        avg_at = {}
+        for r, c, sell, q, p, m in zip(
+            ev_row.tolist(), code[ev_row].tolist(), ev_sell[order].tolist(),
+            qty[ev_row].tolist(), buy_px[ev_row].tolist(), sale_matched[ev_row].tolist(),
+        ):
+            if c != current:
+                held = cost = 0.0
+                current = c
+            if not sell:
+                held += q
+                cost += q * p
+                continue
+
+            avg = cost / held if held else float("nan")
+            avg_at[r] = avg
+            if m:
+                cost -= avg * m
+                held -= m
+
+        matched_cost[list(avg_at)] = list(avg_at.values())
+        realized[s] = np.where(matched > 0, (sell_px[s] - matched_cost[s]) * matched, 0.0)
+
+    # ---- what is left of each buy lot (oldest shares sold first) ----
+    sold_b = sold[b_code]
+    consumed = np.clip(sold_b - (b_cum_qty - qty[b]), 0.0, qty[b])
+    remaining = np.zeros(n)
+    remaining[b] = qty[b] - consumed
+
+    held_qty = np.bincount(code, weights=remaining, minlength=n_sym)
+    realized_sym = np.bincount(code, weights=realized, minlength=n_sym)
+    unmatched_sym = sold - np.bincount(s_code, weights=matched, minlength=n_sym)
+
+    if method == "fifo":
+        basis = np.bincount(code, weights=remaining * buy_px, minlength=n_sym)
+        lot_cost = buy_px
+    else:
+        # average cost of what is still held; every remaining share carries it
+        total_cost = np.bincount(b_code, weights=b_cost, minlength=n_sym)
+        charged = np.zeros(n_sym)
+        np.add.at(charged, s_code, np.nan_to_num(matched_cost[s]) * matched)
+        basis = np.where(held_qty > 0, total_cost - charged, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            lot_cost = (basis / held_qty)[code]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_cost = np.where(held_qty > 0, basis / held_qty, np.nan)
+
+    price = (
+        lots["Last_Updated_Price"].groupby(code).first().reindex(range(n_sym)).to_numpy(dtype=float)
+        if "Last_Updated_Price" in lots.columns else np.full(n_sym, np.nan)
+    )
+    unrealized = np.where(held_qty > 0, held_qty * price - basis, 0.0)
+
+    by_symbol = pd.DataFrame({
+        "Symbol": symbols,
+        "Bought_Kitta": bought,
+        "Sold_Kitta": sold,
+        "Held_Kitta": held_qty,
+        "Unmatched_Kitta": unmatched_sym,
+        "Cost_Basis_NPR": basis,
+        "Avg_Cost": avg_cost,
+        "Price": price,
+        "Realized_PL": realized_sym,
+        "Unrealized_PL": unrealized,
+    })
+
+    by_lot = lots[["Symbol", "position", "Open date", "Closed date",
+                   "Total holding", "Buy price", "Sell price"]].copy()
+    by_lot["Matched_Cost"] = matched_cost
+    by_lot["Realized_PL"] = np.where(is_sell, realized, np.nan)
+    by_lot["Remaining_Kitta"] = remaining
+    by_lot["Remaining_Cost"] = np.where(remaining > 0, lot_cost, np.nan)
+    by_lot["Unrealized_PL"] = np.where(
+        remaining > 0, remaining * (price[code] - lot_cost), 0.0
+    )
+
+    return LotMatch(method, by_symbol, by_lot)
@@ -0,0 +1,161 @@
+# lightweight timing spans for the report pipeline
+#
+#   with Profiler("report", memory=True) as prof:
+#       make_pdf_report(...)
+#   prof.save("output/timings.json")
+#
+# Library code marks its stages with ``span("load/price")`` etc.  Without an
+# active Profiler (the default) a span costs one thread-local lookup.  With
+# one, each span records wall time, process CPU time and, when ``memory`` is
+# on, the tracemalloc peak reached inside it (child peaks roll up to their
+# parents).  Spans nest; a span's path is "parent/child".
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+
+log = logging.getLogger(__name__)
+
+_active = threading.local()
+
+
+def active_profiler():
+    return getattr(_active, "profiler", None)
+
+
+class _Span:
+    __slots__ = ("name", "path", "depth", "t0", "cpu0", "mem0", "peak")
+
+    def __init__(self, name, path, depth):
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.t0 = time.perf_counter()
+        self.cpu0 = time.process_time()
+        self.mem0 = 0
+        self.peak = 0
+
+
+class Profiler:
+    def __init__(self, name="report", memory=False):
+        self.name = name
+        self.memory = memory
+        self.spans = []
+        self._stack = []
+        self._outer = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        self._outer = active_profiler()
+        _active.profiler = self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall_s = time.perf_counter() - self._t0
+        self.cpu_s = time.process_time() - self._cpu0
+        if self._started_tracing:
+            tracemalloc.stop()
+        _active.profiler = self._outer
+        log.info("%s: %.3fs wall, %.3fs cpu", self.name, self.wall_s, self.cpu_s)
+        for stage in self.stages():
+            log.debug("  %-28s %4dx %8.3fs", stage["path"], stage["count"], stage["wall_s"])
+        return False
+
+    # ------------------------------------------------------------
+    # SPANS
+    # ------------------------------------------------------------
+    def _open(self, name):
+        parent = self._stack[-1] if self._stack else None
+        path = f"{parent.path}/{name}" if parent else name
+        s = _Span(name, path, len(self._stack))
+
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if parent:
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            s.mem0 = current
+            s.peak = current
+
+        self._stack.append(s)
+        return s
+
+    def _close(self, s, meta):
+        self._stack.pop()
+        peak_kb = None
+        if self.memory and tracemalloc.is_tracing():
+            s.peak = max(s.peak, tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, s.peak)
+            peak_kb = round((s.peak - s.mem0) / 1024, 1)
+
+        self.spans.append({
+            "path": s.path,
+            "depth": s.depth,
+            "start_s": round(s.t0 - self._t0, 6),
+            "wall_s": round(time.perf_counter() - s.t0, 6),
+            "cpu_s": round(time.process_time() - s.cpu0, 6),
+            "peak_kb": peak_kb,
+            **meta,
+        })
+
+    # ------------------------------------------------------------
+    # REPORT
+    # ------------------------------------------------------------
+    def stages(self) -> list:
+        """Spans summed per path, sorted by path (parents before children)."""
+        out = {}
+        for sp in self.spans:
+            st = out.setdefault(sp["path"], {
+                "path": sp["path"], "count": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_kb": None,
+            })
+            st["count"] += 1
+            st["wall_s"] += sp["wall_s"]
+            st["cpu_s"] += sp["cpu_s"]
+            if sp["peak_kb"] is not None:
+                st["peak_kb"] = max(st["peak_kb"] or 0.0, sp["peak_kb"])
+        stages = sorted(out.values(), key=lambda st: st["path"])
+        for st in stages:
+            st["wall_s"] = round(st["wall_s"], 6)
+            st["cpu_s"] = round(st["cpu_s"], 6)
+        return stages
+
+    def report(self) -> dict:
+        return {
+            "name": self.name,
+            "wall_s": round(getattr(self, "wall_s", time.perf_counter() - self._t0), 6),
+            "cpu_s": round(getattr(self, "cpu_s", time.process_time() - self._cpu0), 6),
+            "memory": self.memory,
+            "stages": self.stages(),
+            "spans": self.spans,
+        }
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2))
+        return path
+
+
+@contextmanager
+def span(name: str, **meta):
+    """Time the enclosed block under the active Profiler (no-op without one)."""
+    prof = active_profiler()
+    if prof is None:
+        yield
+        return
+
+    s = prof._open(name)
+    try:
+        yield
+    finally:
+        prof._close(s, meta)
@@ -0,0 +1,253 @@
+# single-pass portfolio engine: normalize + merge once, derive every summary
+import numpy as np
+import pandas as pd
+
+from nepse_portfoli.core.lot_matching import LotMatch, match_lots
+from nepse_portfoli.core.symbols import SymbolIndex, normalize_symbol
+
+
+PRICE_CANDIDATES = [
+    "Last Updated Price",
+    "Last Updated price",
+]
+
+
+def _detect_price_column(price_df: pd.DataFrame) -> str:
+    """Find the correct NEPSE price column."""
+    for c in PRICE_CANDIDATES:
+        if c in price_df.columns:
+            return c
+
+    raise ValueError(
+        f"Could not find price column in NEPSE file. Found: {list(price_df.columns)}"
+    )
+
+
+SYMBOL_SUMMARY_COLUMNS = [
+    "sn",
+    "Symbol",
+    "Total Kitta",
+    "Current share Price",
+    "Buy share price",
+    "Investment_NPR",
+    "Market_Value_NPR",
+    "PL",
+    "PL%",
+    "Sector",
+]
+
+
+def to_number(s: pd.Series) -> pd.Series:
+    """Parse a column that may hold comma-formatted numbers ("1,234")."""
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+
+    return pd.to_numeric(
+        s.astype(str).str.replace(",", "", regex=False).str.strip(),
+        errors="coerce"
+    )
+
+
+# ------------------------------------------------------------
+# AGGREGATION STEPS
+# Shared by PortfolioSnapshot and the incremental engine (which keeps
+# per-symbol aggregates between runs and only re-aggregates changed symbols).
+# ------------------------------------------------------------
+def aggregate_symbols(lots: pd.DataFrame) -> pd.DataFrame:
+    """Per-symbol sums of ``lots``, sorted by symbol; Sector may be NaN."""
+    return (
+        lots.groupby("Symbol", as_index=False)
+        .agg(**{
+            "Total Kitta": ("Total holding", "sum"),
+            "Investment_NPR": ("Investment_NPR", "sum"),
+            "Market_Value_NPR": ("Market_Value_NPR", "sum"),
+            # "first" skips NaN, i.e. the first lot that has a sector
+            "Sector": ("Sector", "first"),
+        })
+    )
+
+
+def finish_symbol_summary(summary: pd.DataFrame) -> pd.DataFrame:
+    """Per-symbol sums -> the symbol summary (prices, P/L, sn)."""
+    summary = summary.copy()
+    kitta = summary["Total Kitta"].where(summary["Total Kitta"] != 0)
+    investment = summary["Investment_NPR"].where(summary["Investment_NPR"] != 0)
+
+    summary["Current share Price"] = summary["Market_Value_NPR"] / kitta
+    summary["Buy share price"] = summary["Investment_NPR"] / kitta
+    summary["PL"] = summary["Market_Value_NPR"] - summary["Investment_NPR"]
+    summary["PL%"] = summary["PL"] / investment
+    summary["Sector"] = summary["Sector"].fillna("Unknown")
+
+    summary.insert(0, "sn", range(1, len(summary) + 1))
+    return summary[SYMBOL_SUMMARY_COLUMNS]
+
+
+def summarize_sectors(rows: pd.DataFrame, kitta_col="Total holding") -> pd.DataFrame:
+    """Sector summary from open lots (or per-symbol sums, ``kitta_col="Total Kitta"``)."""
+    sector = (
+        rows.groupby("Sector", dropna=False, as_index=False)
+        .agg(
+            Total_Kitta=(kitta_col, "sum"),
+            Investment_NPR=("Investment_NPR", "sum"),
+            Market_Value_NPR=("Market_Value_NPR", "sum"),
+        )
+    )
+
+    sector["Sector"] = sector["Sector"].fillna("Unknown")
+    sector["PL"] = sector["Market_Value_NPR"] - sector["Investment_NPR"]
+    sector["PL%"] = sector["PL"] / sector["Investment_NPR"].replace({0: pd.NA})
+
+    total_inv = sector["Investment_NPR"].sum()
+    sector["Allocation%"] = sector["Investment_NPR"] / total_inv if total_inv else pd.NA
+
+    sector["Label"] = sector.apply(
+        lambda r: f"{r['Sector']} ({r['Allocation%']*100:.1f}%)"
+        if pd.notnull(r["Allocation%"]) else f"{r['Sector']} (0.0%)",
+        axis=1
+    )
+
+    sector.insert(0, "sn", range(1, len(sector) + 1))
+    return sector
+
+
+def portfolio_totals(sector: pd.DataFrame, realized: pd.DataFrame) -> dict:
+    return {
+        "total_inv": float(sector["Investment_NPR"].sum()),
+        "total_mv": float(sector["Market_Value_NPR"].sum()),
+        "total_realized": (
+            float(realized["Realized_Profit_NPR"].sum()) if not realized.empty else 0.0
+        ),
+    }
+
+
+class PortfolioSnapshot:
+    """One trading journal valued against one price file and sector map.
+
+    The journal is normalized, priced and sector-tagged once in ``lots``;
+    the symbol, sector and realized views are derived from that frame and
+    cached, so callers can ask for all of them without repeating the work.
+
+    ``index`` is the SymbolIndex of the journal's symbols (``lots["code"]``
+    holds each lot's code); ``prices`` and ``sectors`` are aligned to it.
+
+    ``realized_method`` None prices every closed row against its own buy
+    price (the journal's view); "fifo" or "average" match sells to buys
+    across rows instead (see core/lot_matching.py).
+    """
+
+    def __init__(
+        self,
+        journal: pd.DataFrame,
+        price_df: pd.DataFrame = None,
+        sector_df: pd.DataFrame = None,
+        realized_method: str = None,
+    ):
+        # realized P/L needs neither prices nor sectors, so both are optional
+        self.price_col = _detect_price_column(price_df) if price_df is not None else None
+        self.realized_method = realized_method
+        self.lots = self._build_lots(journal, price_df, sector_df)
+        self._views = {}
+
+    def _build_lots(self, journal, price_df, sector_df) -> pd.DataFrame:
+        symbols = normalize_symbol(journal["Symbol"])
+        self.index = SymbolIndex(symbols, canonical=True)
+        code = self.index.codes(symbols, canonical=True)
+
+        lots = pd.DataFrame({
+            "Symbol": symbols,
+            "code": code,
+            "has_symbol": journal["Symbol"].notna(),
+            "position": journal["position"].astype(str).str.strip().str.lower(),
+        })
+
+        for col in ["Buy price", "Sell price", "Total holding"]:
+            if col in journal.columns:
+                lots[col] = to_number(journal[col])
+            else:
+                lots[col] = float("nan")
+
+        for col in ["Open date", "Closed date"]:
+            if col in journal.columns:
+                lots[col] = pd.to_datetime(journal[col], errors="coerce")
+            else:
+                lots[col] = pd.NaT
+
+        # one value per symbol, then gathered per lot by code
+        if price_df is not None:
+            self.prices = self.index.align(price_df, to_number(price_df[self.price_col]))
+        else:
+            self.prices = np.full(len(self.index), np.nan)
+
+        if sector_df is not None:
+            self.sectors = self.index.align(sector_df, sector_df["Sector"])
+        else:
+            self.sectors = np.full(len(self.index), None, dtype=object)
+
+        lots["Last_Updated_Price"] = self.prices[code]
+        lots["Sector"] = self.sectors[code]
+
+        lots["Investment_NPR"] = lots["Buy price"] * lots["Total holding"]
+        lots["Market_Value_NPR"] = lots["Last_Updated_Price"] * lots["Total holding"]
+        return lots
+
+    # ------------------------------------------------------------
+    # LOT VIEWS
+    # ------------------------------------------------------------
+    @property
+    def open_lots(self) -> pd.DataFrame:
+        return self.lots[self.lots["position"] == "o"]
+
+    @property
+    def closed_lots(self) -> pd.DataFrame:
+        return self.lots[self.lots["position"] == "c"]
+
+    def _view(self, name, build):
+        if name not in self._views:
+            self._views[name] = build()
+        return self._views[name]
+
+    # ------------------------------------------------------------
+    # SUMMARIES
+    # ------------------------------------------------------------
+    def symbol_summary(self) -> pd.DataFrame:
+        return self._view("symbol", self._build_symbol_summary)
+
+    def sector_summary(self) -> pd.DataFrame:
+        return self._view("sector", self._build_sector_summary)
+
+    def realized_summary(self) -> pd.DataFrame:
+        return self._view("realized", self._build_realized_summary)
+
+    def unmapped_symbols(self) -> list:
+        """Journal symbols the sector map has no sector for (shown as Unknown)."""
+        codes = np.unique(self.lots.loc[self.lots["has_symbol"], "code"].to_numpy())
+        missing = pd.isna(self.sectors[codes])
+        return sorted(self.index.symbols[codes][missing])
+
+    def lot_match(self, method="fifo") -> LotMatch:
+        """Realized + unrealized P/L per symbol and per lot by lot matching."""
+        return self._view(f"match/{method}", lambda: match_lots(self.lots, method))
+
+    def totals(self) -> dict:
+        return portfolio_totals(self.sector_summary(), self.realized_summary())
+
+    def _build_symbol_summary(self) -> pd.DataFrame:
+        return finish_symbol_summary(aggregate_symbols(self.open_lots))
+
+    def _build_sector_summary(self) -> pd.DataFrame:
+        return summarize_sectors(self.open_lots)
+
+    def _build_realized_summary(self) -> pd.DataFrame:
+        if self.realized_method is not None:
+            return self.lot_match(self.realized_method).realized_summary()
+
+        c = self.closed_lots
+        c = c[c["has_symbol"]].dropna(subset=["Sell price", "Buy price", "Total holding"])
+        c = c.assign(Realized_Profit_NPR=(c["Sell price"] - c["Buy price"]) * c["Total holding"])
+
+        return (
+            c.groupby("Symbol", as_index=False)["Realized_Profit_NPR"]
+            .sum()
+            .sort_values("Realized_Profit_NPR", ascending=False)
+        )
@@ -0,0 +1,58 @@
+# canonical symbols and their integer codes
+#
+# Journal, price file and sector map spell symbols independently (" nabil",
+# "NABIL ").  A SymbolIndex canonicalizes a set of symbols once and gives
+# each a dense int code (a pandas categorical); lookups against other
+# frames are then NumPy arrays aligned to the codes, so per-lot values are
+# a single ``array[codes]`` gather instead of a string merge/map.
+import numpy as np
+import pandas as pd
+
+
+def normalize_symbol(s: pd.Series) -> pd.Series:
+    return s.astype(str).str.strip().str.upper()
+
+
+class SymbolIndex:
+    """Sorted canonical symbols; a symbol's code is its position."""
+
+    def __init__(self, symbols, canonical=False):
+        s = pd.Series(symbols)
+        if not canonical:
+            s = normalize_symbol(s)
+        self.dtype = pd.CategoricalDtype(pd.Index(s.unique()).sort_values())
+
+    def __len__(self) -> int:
+        return len(self.dtype.categories)
+
+    @property
+    def symbols(self) -> np.ndarray:
+        return self.dtype.categories.to_numpy(dtype=object)
+
+    def codes(self, symbols, canonical=False) -> np.ndarray:
+        """Code per symbol; -1 for symbols not in the index."""
+        s = pd.Series(symbols)
+        if not canonical:
+            s = normalize_symbol(s)
+        # get_indexer gives -1 for unknown symbols; a Categorical built from
+        # them would warn (and raise in pandas 4)
+        return self.dtype.categories.get_indexer(s).astype("int64")
+
+    def align(self, df: pd.DataFrame, values) -> np.ndarray:
+        """``values`` (one per row of ``df``) as an array over the index.
+
+        Rows are matched on ``df["Symbol"]`` and the first row wins on
+        duplicates.  Symbols without a row get NaN (numeric values) or None.
+        """
+        codes = self.codes(df["Symbol"])
+        values = np.asarray(values)
+
+        known = np.flatnonzero(codes >= 0)
+        uniq, first = np.unique(codes[known], return_index=True)
+
+        if values.dtype.kind in "fiu":
+            out = np.full(len(self), np.nan)
+        else:
+            out = np.full(len(self), None, dtype=object)
+        out[uniq] = values[known[first]]
+        return out
@@ -0,0 +1,150 @@
+# portfolio valuation across many price dates in one vectorized pass
+#
+# A lot is held on date d when it was opened on/before d and not closed
+# on/before d (open lots have no close).  Rather than looping the single-date
+# summaries, each lot becomes a +qty event at its open index and a -qty
+# event at its close index on the date axis; a cumulative sum gives the held
+# quantity (and cost) for every (date, symbol) at once, which is then
+# multiplied against the dates x symbols price matrix from the price store.
+# Cost is O(lots + dates * symbols).
+import numpy as np
+import pandas as pd
+
+from nepse_portfoli.core.snapshot import PortfolioSnapshot
+from nepse_portfoli.io.price_store import PriceStore
+
+
+class PortfolioTimeSeries:
+    """Frames produced by ``value_portfolio_over_time``.
+
+    totals     one row per date: Investment_NPR, Market_Value_NPR, PL, PL%,
+               Day_PL (change in PL since the previous date)
+    by_sector  one row per (date, sector); MV_Allocation% is the sector's
+               share of that date's market value (the snapshot's Allocation%
+               is the share of investment)
+    by_symbol  one row per (date, symbol) with a holding on that date
+    """
+
+    def __init__(self, totals, by_sector, by_symbol):
+        self.totals = totals
+        self.by_sector = by_sector
+        self.by_symbol = by_symbol
+
+
+def _held_matrix(start, end, code, values, n_dates, n_symbols) -> np.ndarray:
+    """dates x symbols sum of ``values`` over lots held at each date."""
+    delta = np.zeros((n_dates + 1, n_symbols))
+    np.add.at(delta, (start, code), values)
+    np.add.at(delta, (end, code), -values)
+    return np.cumsum(delta[:-1], axis=0)
+
+
+def value_portfolio_over_time(
+    journal,
+    price_dates=None,
+    store: PriceStore = None,
+    sector_df: pd.DataFrame = None,
+) -> PortfolioTimeSeries:
+    """Value the journal at every date in ``price_dates``.
+
+    ``journal`` is a trading-journal frame (or a PortfolioSnapshot built
+    from one).  ``price_dates`` defaults to every date in ``store``; dates
+    without prices resolve to the latest stored date before them.
+    """
+    store = store or PriceStore()
+
+    if isinstance(journal, PortfolioSnapshot):
+        snapshot = journal
+    else:
+        snapshot = PortfolioSnapshot(journal, sector_df=sector_df)
+    lots = snapshot.lots
+
+    if price_dates is None:
+        days = list(store.dates())
+    else:
+        days = sorted({store.resolve_date(d) for d in price_dates})
+    if not days:
+        raise ValueError("No price dates to value the portfolio at")
+
+    # ---- lots -> (symbol code, [start, end) on the date axis) ----
+    lots = lots[lots["has_symbol"] & lots["position"].isin(["o", "c"])]
+    qty = lots["Total holding"].fillna(0).to_numpy()
+    cost = lots["Investment_NPR"].fillna(0).to_numpy()
+
+    dates = pd.DatetimeIndex(pd.to_datetime(days))
+    opened = lots["Open date"].fillna(pd.Timestamp.min).to_numpy(dtype="datetime64[ns]")
+    # closed lots without a close date cannot be placed in time: never held
+    closed = lots["Closed date"].where(
+        lots["position"] == "c",
+        pd.Timestamp.max,
+    ).fillna(pd.Timestamp.min).to_numpy(dtype="datetime64[ns]")
+
+    date_axis = dates.to_numpy(dtype="datetime64[ns]")
+    start = np.searchsorted(date_axis, opened, side="left")
+    end = np.searchsorted(date_axis, closed, side="left")
+    end = np.maximum(start, end)
+
+    # symbol axis = the snapshot's SymbolIndex, lots already carry their codes
+    symbols = snapshot.index.symbols
+    code = lots["code"].to_numpy()
+    n_dates, n_symbols = len(days), len(symbols)
+
+    held_qty = _held_matrix(start, end, code, qty, n_dates, n_symbols)
+    held_cost = _held_matrix(start, end, code, cost, n_dates, n_symbols)
+
+    # ---- dates x symbols prices, one store lookup per date ----
+    store_codes = store.codes_for(symbols)
+    known = store_codes >= 0
+    prices = np.full((n_dates, n_symbols), np.nan)
+    for i, day in enumerate(days):
+        prices[i, known] = store.price_array(day)[store_codes[known]]
+
+    market_value = np.where(held_qty != 0, held_qty * prices, 0.0)
+    market_value = np.nan_to_num(market_value)
+
+    # ---- totals ----
+    inv_total = held_cost.sum(axis=1)
+    mv_total = market_value.sum(axis=1)
+    totals = pd.DataFrame({
+        "Date": dates,
+        "Investment_NPR": inv_total,
+        "Market_Value_NPR": mv_total,
+    })
+    totals["PL"] = totals["Market_Value_NPR"] - totals["Investment_NPR"]
+    totals["PL%"] = totals["PL"] / totals["Investment_NPR"].where(totals["Investment_NPR"] != 0)
+    totals["Day_PL"] = totals["PL"].diff()
+
+    # ---- per symbol (long, held rows only) ----
+    d_idx, s_idx = np.nonzero(held_qty)
+    by_symbol = pd.DataFrame({
+        "Date": dates[d_idx],
+        "Symbol": symbols[s_idx],
+        "Total Kitta": held_qty[d_idx, s_idx],
+        "Price": prices[d_idx, s_idx],
+        "Investment_NPR": held_cost[d_idx, s_idx],
+        "Market_Value_NPR": market_value[d_idx, s_idx],
+    })
+    by_symbol["PL"] = by_symbol["Market_Value_NPR"] - by_symbol["Investment_NPR"]
+
+    # ---- per sector: symbols -> sectors is a small one-hot matmul ----
+    sector_of = pd.Series(snapshot.sectors).fillna("Unknown").to_numpy(dtype=str)
+    sectors, sector_code = np.unique(sector_of, return_inverse=True)
+    onehot = np.zeros((n_symbols, len(sectors)))
+    onehot[np.arange(n_symbols), sector_code] = 1.0
+
+    sec_inv = held_cost @ onehot
+    sec_mv = market_value @ onehot
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sec_alloc = sec_mv / mv_total[:, None]
+
+    by_sector = pd.DataFrame({
+        "Date": np.repeat(dates, len(sectors)),
+        "Sector": np.tile(sectors, n_dates),
+        "Investment_NPR": sec_inv.ravel(),
+        "Market_Value_NPR": sec_mv.ravel(),
+        "MV_Allocation%": sec_alloc.ravel(),
+    })
+    by_sector["PL"] = by_sector["Market_Value_NPR"] - by_sector["Investment_NPR"]
+    by_sector = by_sector[by_sector["Investment_NPR"] != 0].reset_index(drop=True)
+
+    return PortfolioTimeSeries(totals, by_sector, by_symbol)
@@ -0,0 +1,28 @@
+# write-then-rename, so readers never see a partially written file
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write(path, data) -> Path:
+    """Replace ``path`` with ``data`` in one step.
+
+    ``data`` is bytes, or a callable that writes to the open binary file
+    (e.g. ``lambda f: np.savez(f, **arrays)``).  The temp file gets a
+    unique name next to ``path``, so concurrent writers never share it.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False)
+    try:
+        with tmp as f:
+            if callable(data):
+                data(f)
+            else:
+                f.write(data)
+        os.replace(tmp.name, path)
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+    return path
@@ -0,0 +1,151 @@
+# offline-first resolution of the default journal / price files
+#
+# Order of preference for a default URL:
+#   1. the copy already shipped in data/ (same file name as the URL)
+#   2. a previous download in the HTTP cache, revalidated with
+#      ETag / If-Modified-Since when it is older than ``max_age``
+#   3. a fresh download
+# A network failure falls back to a stale cached copy, so an air-gapped
+# host never blocks on GitHub as long as data/ or the cache has the file.
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlparse, unquote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from nepse_portfoli.config.paths import CACHE_DIR, DATA_DIR
+from nepse_portfoli.io.atomic import atomic_write
+
+
+# (connect, read) seconds
+TIMEOUT = (5, 30)
+MAX_AGE = 60 * 60
+
+_session = None
+_temp_files = []
+
+
+def short_name(source):
+    parsed = urlparse(str(source))
+
+    if parsed.scheme:   # it's a URL
+        return Path(unquote(parsed.path)).name
+
+    return Path(str(source)).name
+
+
+def get_session() -> requests.Session:
+    """Process-wide pooled session with bounded retries."""
+    global _session
+    if _session is None:
+        retry = Retry(
+            total=2,
+            connect=1,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+        )
+        s = requests.Session()
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=8)
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        _session = s
+    return _session
+
+
+class HttpCache:
+    """Downloaded files plus their validators, one pair per URL."""
+
+    def __init__(self, root=CACHE_DIR / "http"):
+        self.root = Path(root)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        # keep the suffix: readers pick csv vs excel from it
+        body = self.root / f"{key}{Path(short_name(url)).suffix}"
+        return body, self.root / f"{key}.json"
+
+    def fetch(self, url: str, max_age=MAX_AGE, timeout=TIMEOUT) -> Path:
+        body, meta_path = self._paths(url)
+
+        meta = {}
+        if body.exists() and meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text())
+            except ValueError:
+                meta = {}
+
+        if meta and time.time() - meta.get("checked", 0) < max_age:
+            return body
+
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            r = get_session().get(url, headers=headers, timeout=timeout)
+            if r.status_code != 304:
+                r.raise_for_status()
+        except requests.RequestException:
+            if body.exists():
+                return body  # offline: a stale copy beats no report
+            raise
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        if r.status_code != 304:
+            atomic_write(body, r.content)
+            meta = {
+                "url": url,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+            }
+
+        meta["checked"] = time.time()
+        atomic_write(meta_path, json.dumps(meta).encode())
+        return body
+
+
+http_cache = HttpCache()
+
+
+def resolve_source(url: str, data_dir=DATA_DIR, max_age=MAX_AGE) -> Path:
+    """Local path for a default data file named by ``url``."""
+    local = Path(data_dir) / short_name(url)
+    if local.exists():
+        return local
+
+    return http_cache.fetch(url, max_age=max_age)
+
+
+def download_to_temp(url):
+    """Download ``url`` into a temp file (removed at interpreter exit).
+
+    Prefer ``resolve_source``, which avoids the download altogether when a
+    local or cached copy exists.
+    """
+    r = get_session().get(url, timeout=TIMEOUT)
+    r.raise_for_status()
+    suffix = Path(short_name(url)).suffix
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    tmp.write(r.content)
+    tmp.seek(0)
+    _temp_files.append(tmp.name)
+    return tmp
+
+
+@atexit.register
+def _cleanup_temp_files():
+    for name in _temp_files:
+        try:
+            os.unlink(name)
+        except OSError:
+            pass
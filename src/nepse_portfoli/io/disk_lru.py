@@ -0,0 +1,70 @@
+# on-disk LRU of files under one directory, bounded by bytes and entry count
+#
+# Shared by io/parsed_cache.py (pickled frames) and core/chart_cache.py
+# (rendered chart bytes).  A file's mtime is the LRU clock: reads touch it,
+# and eviction drops the oldest files first once the directory holds more
+# than ``max_bytes`` or ``max_entries``.  Writes go through atomic_write, so
+# several processes can share the directory.
+import os
+from pathlib import Path
+
+from nepse_portfoli.io.atomic import atomic_write
+
+
+class DiskLRU:
+    """Files named ``<key><suffix>`` under ``root``; subclasses set ``suffixes``."""
+
+    suffixes = ()
+
+    def __init__(self, root, max_bytes, max_entries):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def _files(self):
+        for suffix in self.suffixes:
+            yield from self.root.glob(f"*{suffix}")
+
+    def read(self, name: str, load=Path.read_bytes):
+        """``load(path)`` for the entry ``name``; None when missing or unreadable."""
+        path = self.root / name
+        try:
+            value = load(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # truncated / unreadable entry: drop it and rebuild
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted by another process meanwhile
+        return value
+
+    def write(self, name: str, data) -> None:
+        """Store ``data`` (bytes or a writer callable, see atomic_write), then evict."""
+        atomic_write(self.root / name, data)
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for p in self._files():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+
+        entries.sort()  # oldest first
+        total = sum(size for _, size, _ in entries)
+
+        while entries and (total > self.max_bytes or len(entries) > self.max_entries):
+            _, size, p = entries.pop(0)
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for p in self._files():
+            p.unlink(missing_ok=True)
@@ -0,0 +1,216 @@
+# numeric exports of the portfolio summaries (for analysts; the PDF is for reading)
+#
+# One pass over the computed frames feeds every requested format at once:
+#
+#   xlsx     one workbook, one sheet per table (openpyxl write-only mode,
+#            rows are streamed to disk instead of building the sheet in memory)
+#   parquet  <table>.parquet per table, one row group per chunk
+#   arrow    <table>.arrow per table (Arrow IPC file), one record batch per chunk
+#
+# Tables: symbol_summary, sector_summary, realized_summary and, when a price
+# store is given, the valuation time series (totals, by_sector, by_symbol).
+# The time series is computed and written a block of dates at a time, so a
+# multi-year export never holds every (date, symbol) row in memory.
+#
+# Parquet/Arrow need pyarrow, which is optional (not in requirements.txt);
+# xlsx only needs openpyxl.
+#
+# Usage:
+#   with ExportWriter("output/export", formats=("xlsx", "parquet")) as out:
+#       out.write("symbol_summary", snapshot.symbol_summary())
+#   export_summaries(snapshot, "output/export", store=PriceStore())
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+FORMATS = ("xlsx", "parquet", "arrow")
+
+# dates valued (and written) per time-series chunk
+CHUNK_DATES = 64
+
+# Excel's row limit; longer tables continue on "<table> (2)", ...
+XLSX_MAX_ROWS = 1_048_576
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            "Parquet/Arrow export needs pyarrow (pip install pyarrow); "
+            "xlsx export works without it"
+        ) from e
+    return pa
+
+
+def _cell(v):
+    if v is None or v is pd.NaT:
+        return None
+    if isinstance(v, float) and np.isnan(v):
+        return None
+    if isinstance(v, pd.Timestamp):
+        return v.to_pydatetime()
+    return v
+
+
+class ExportWriter:
+    """Appends frames (chunks) to per-table outputs in every format."""
+
+    def __init__(self, out_dir, formats=("xlsx",), stem="nepse_portfolio"):
+        bad = [f for f in formats if f not in FORMATS]
+        if bad:
+            raise ValueError(f"formats must be among {FORMATS}, got {bad}")
+
+        self.out_dir = Path(out_dir)
+        self.formats = tuple(formats)
+        self.stem = stem
+        self.paths = {}
+
+        self._pa = _pyarrow() if {"parquet", "arrow"} & set(self.formats) else None
+        self._workbook = None
+        self._sheets = {}    # table -> (sheet, rows written, part)
+        self._schemas = {}   # table -> arrow schema of the first non-empty chunk
+        self._empty = {}     # table -> empty chunk, while no rows were written
+        self._arrow = {}     # (table, format) -> open parquet/IPC writer
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # ------------------------------------------------------------
+    # WRITE
+    # ------------------------------------------------------------
+    def write(self, table: str, df: pd.DataFrame) -> None:
+        """Append ``df`` to ``table``; later chunks must have the same columns."""
+        if "xlsx" in self.formats:
+            self._write_xlsx(table, df)
+        if self._pa is not None:
+            self._write_arrow(table, df)
+
+    def _write_xlsx(self, table, df):
+        if self._workbook is None:
+            from openpyxl import Workbook
+
+            self._workbook = Workbook(write_only=True)
+            self.paths["xlsx"] = self.out_dir / f"{self.stem}.xlsx"
+
+        sheet, rows, part = self._sheets.get(table, (None, 0, 0))
+        cols = [df[c].astype(object).tolist() for c in df.columns]
+
+        for row in zip(*cols):
+            if sheet is None or rows >= XLSX_MAX_ROWS:
+                part += 1
+                title = table if part == 1 else f"{table} ({part})"
+                sheet = self._workbook.create_sheet(title[:31])
+                sheet.append([str(c) for c in df.columns])
+                rows = 1
+            sheet.append([_cell(v) for v in row])
+            rows += 1
+
+        if sheet is None:  # empty table: header only
+            sheet = self._workbook.create_sheet(table[:31])
+            sheet.append([str(c) for c in df.columns])
+            rows, part = 1, 1
+        self._sheets[table] = (sheet, rows, part)
+
+    def _write_arrow(self, table, df):
+        pa = self._pa
+        schema = self._schemas.get(table)
+        if schema is None and df.empty:
+            # an empty chunk types its object columns as null; wait for
+            # rows to fix the schema (close() writes all-empty tables)
+            self._empty[table] = df
+            return
+        batch = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        if schema is None:
+            self._schemas[table] = schema = batch.schema
+            self._empty.pop(table, None)
+
+        for fmt in ("parquet", "arrow"):
+            if fmt not in self.formats:
+                continue
+            writer = self._arrow.get((table, fmt))
+            if writer is None:
+                path = self.out_dir / f"{table}.{fmt}"
+                if fmt == "parquet":
+                    import pyarrow.parquet as pq
+                    writer = pq.ParquetWriter(path, schema)
+                else:
+                    writer = pa.ipc.new_file(path, schema)
+                self._arrow[(table, fmt)] = writer
+                self.paths[f"{table}.{fmt}"] = path
+            writer.write_table(batch)
+
+    def close(self) -> dict:
+        """Finish every file; returns {output name: path}."""
+        for table, df in list(self._empty.items()):
+            self._schemas[table] = self._pa.Table.from_pandas(df, preserve_index=False).schema
+            self._write_arrow(table, df)
+        self._empty.clear()
+        for writer in self._arrow.values():
+            writer.close()
+        self._arrow.clear()
+        if self._workbook is not None:
+            self._workbook.save(self.paths["xlsx"])
+            self._workbook = None
+        return self.paths
+
+
+# ------------------------------------------------------------
+# TIME SERIES, CHUNKED
+# ------------------------------------------------------------
+def timeseries_chunks(snapshot, store, price_dates=None, chunk_dates=CHUNK_DATES):
+    """PortfolioTimeSeries per block of ``chunk_dates`` dates, oldest first.
+
+    Day_PL is carried across blocks, so concatenating the chunks equals one
+    ``value_portfolio_over_time`` call over all the dates.
+    """
+    from nepse_portfoli.core.valuation import value_portfolio_over_time
+
+    days = list(store.dates()) if price_dates is None else sorted(
+        {store.resolve_date(d) for d in price_dates}
+    )
+    last_pl = None
+    for i in range(0, len(days), chunk_dates):
+        ts = value_portfolio_over_time(snapshot, days[i:i + chunk_dates], store)
+        if last_pl is not None and len(ts.totals):
+            ts.totals.loc[0, "Day_PL"] = ts.totals.loc[0, "PL"] - last_pl
+        if len(ts.totals):
+            last_pl = ts.totals["PL"].iloc[-1]
+        yield ts
+
+
+def export_summaries(
+    summaries,
+    out_dir,
+    formats=("xlsx",),
+    store=None,
+    price_dates=None,
+    chunk_dates=CHUNK_DATES,
+    stem="nepse_portfolio",
+) -> dict:
+    """Write the summaries (and the valuation time series) in one pass.
+
+    ``summaries`` is a PortfolioSnapshot or the incremental engine's
+    PortfolioSummaries.  The time series is added when ``store`` has
+    prices and ``summaries`` still has its lots (a PortfolioSnapshot).
+    Returns {output name: path}.
+    """
+    with ExportWriter(out_dir, formats, stem) as out:
+        out.write("symbol_summary", summaries.symbol_summary())
+        out.write("sector_summary", summaries.sector_summary())
+        out.write("realized_summary", summaries.realized_summary())
+
+        if store is not None and store.dates() and hasattr(summaries, "lots"):
+            for ts in timeseries_chunks(summaries, store, price_dates, chunk_dates):
+                out.write("valuation_totals", ts.totals)
+                out.write("valuation_by_sector", ts.by_sector)
+                out.write("valuation_by_symbol", ts.by_symbol)
+    return out.paths
@@ -0,0 +1,97 @@
+# content-addressed cache of parsed input files (journal sheets, price files)
+#
+# Parsing .xls/.xlsm through xlrd/openpyxl is the slowest part of a report,
+# and users regenerate reports from the same uploads all the time.  Frames
+# are stored under a key built from the file's SHA-256 plus the parse
+# options, so a renamed or re-uploaded file with the same bytes is a hit and
+# an edited file with the same name is a miss.
+#
+# Frames are pickled: journal sheets carry mixed object columns that
+# Parquet/Feather would need pyarrow (not a dependency) to round-trip.
+import hashlib
+import json
+import pickle
+
+import pandas as pd
+
+from nepse_portfoli.config.paths import CACHE_DIR
+from nepse_portfoli.io.disk_lru import DiskLRU
+
+
+MAX_BYTES = 256 * 1024 * 1024
+MAX_ENTRIES = 128
+
+
+def file_digest(source) -> str:
+    """SHA-256 of a path or file-like object (rewound afterwards)."""
+    h = hashlib.sha256()
+
+    if hasattr(source, "read"):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            h.update(chunk)
+        if hasattr(source, "seek"):
+            source.seek(0)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+
+    return h.hexdigest()
+
+
+def _unpickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ParsedFileCache(DiskLRU):
+    """On-disk LRU of parsed DataFrames, bounded by bytes and entry count."""
+
+    suffixes = (".pkl",)
+
+    def __init__(self, root=CACHE_DIR / "parsed", max_bytes=MAX_BYTES, max_entries=MAX_ENTRIES):
+        super().__init__(root, max_bytes, max_entries)
+
+    def key(self, digest: str, kind: str, **params) -> str:
+        raw = json.dumps([digest, kind, params], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str):
+        return self.read(f"{key}.pkl", _unpickle)
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        self.write(f"{key}.pkl", lambda f: pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def load(self, source, kind: str, parse, **params) -> pd.DataFrame:
+        """Return ``parse()`` for ``source``, served from cache when possible.
+
+        ``kind`` names the parser (bump its version suffix when the parse
+        logic changes) and ``params`` are the options that affect the result.
+        """
+        try:
+            digest = file_digest(source)
+        except (OSError, TypeError):
+            # not something we can hash (URL, text buffer): just parse it
+            if hasattr(source, "seek"):
+                source.seek(0)
+            return parse()
+
+        key = self.key(digest, kind, **params)
+        df = self.get(key)
+        if df is not None:
+            return df
+
+        df = parse()
+        if hasattr(source, "seek"):
+            source.seek(0)
+
+        try:
+            self.put(key, df)
+        except OSError:
+            pass  # read-only / full disk: caching is best effort
+        return df
+
+
+parsed_cache = ParsedFileCache()
@@ -1,23 +1,12 @@
 import pandas as pd
 
+from nepse_portfoli.io.sector_registry import read_sector_sheet
 
-def read_sector_map(excel_file) -> pd.DataFrame:
-    df = pd.read_excel(
-        excel_file,
-        sheet_name="Sector info",
-        usecols="B:C"
-    )
-
-    cols = list(df.columns)
-    if len(cols) != 2:
-        raise ValueError(f"'Sector info' sheet should have 2 columns, but has: {cols}")
 
-    df = df.rename(columns={cols[0]: "Symbol", cols[1]: "Sector"})
-
-    df["Symbol"] = df["Symbol"].astype(str).str.strip().str.upper()
-    df["Sector"] = df["Sector"].astype(str).str.strip()
-
-    return df.drop_duplicates(subset="Symbol", keep="first")
+def read_sector_map(excel_file) -> pd.DataFrame:
+    # same reader (and cleaning) as the sector registry's workbook source;
+    # unlike the registry, a workbook without the sheet is an error here
+    return read_sector_sheet(excel_file, missing_ok=False)
 
 
 def read_portfolio(excel_file, sheet_name: str) -> pd.DataFrame:
@@ -0,0 +1,204 @@
+# append-only columnar store of daily NEPSE price files
+#
+# Layout under the store root (default data/price_store/):
+#   symbols.json            symbol dictionary; a symbol's code is its position
+#                           in the list and never changes (new symbols append)
+#   dates.json              sorted Business Dates that have a partition
+#   date=YYYY-MM-DD.npz     one partition per Business Date: "code" (int32,
+#                           sorted) plus one float64 array per price column
+#
+# A partition is written once and never rewritten, so loaded partitions can
+# be memoized.  Looking up a date scatters its columns into a dense vector
+# over the dictionary, i.e. O(symbols) with no string work.
+#
+# Usage:
+#   python -m nepse_portfoli.io.price_store ingest "data/Today's Price - *.csv"
+#   python -m nepse_portfoli.io.price_store list
+import argparse
+import bisect
+import glob
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nepse_portfoli.config.paths import DATA_DIR
+from nepse_portfoli.core.snapshot import PRICE_CANDIDATES, _detect_price_column
+from nepse_portfoli.io.atomic import atomic_write
+from nepse_portfoli.io.read_price_file import load_price_file, get_price_date
+
+
+STORE_DIR = DATA_DIR / "price_store"
+
+# the price column is stored under this name, whichever spelling the file used
+PRICE_COLUMN = PRICE_CANDIDATES[0]
+
+PRICE_COLUMNS = [
+    "Open Price",
+    "High Price",
+    "Low Price",
+    "Close Price",
+    PRICE_COLUMN,
+    "Previous Day Close Price",
+    "Total Traded Quantity",
+]
+
+
+def _numeric(s: pd.Series) -> np.ndarray:
+    return pd.to_numeric(
+        s.astype(str).str.replace(",", "", regex=False), errors="coerce"
+    ).to_numpy(dtype="float64")
+
+
+class PriceStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        self._symbols = None
+        self._codes = None
+        self._dates = None
+        self._partitions = {}
+
+    # ------------------------------------------------------------
+    # DICTIONARY + DATE INDEX
+    # ------------------------------------------------------------
+    @property
+    def symbols(self) -> list:
+        if self._symbols is None:
+            path = self.root / "symbols.json"
+            self._symbols = json.loads(path.read_text()) if path.exists() else []
+            self._codes = {s: i for i, s in enumerate(self._symbols)}
+        return self._symbols
+
+    def dates(self) -> list:
+        if self._dates is None:
+            path = self.root / "dates.json"
+            self._dates = json.loads(path.read_text()) if path.exists() else []
+        return self._dates
+
+    def codes_for(self, symbols) -> np.ndarray:
+        """Dictionary codes for ``symbols``; -1 for symbols never seen."""
+        self.symbols  # loads the dictionary
+        return np.array([self._codes.get(s, -1) for s in symbols], dtype="int64")
+
+    def resolve_date(self, date, asof=True) -> str:
+        """Stored date for ``date``; with ``asof`` the latest one on or before it."""
+        day = pd.Timestamp(date).strftime("%Y-%m-%d")
+        dates = self.dates()
+
+        if day in dates:
+            return day
+        if asof:
+            i = bisect.bisect_right(dates, day)
+            if i:
+                return dates[i - 1]
+        raise KeyError(f"No prices stored for {day}")
+
+    # ------------------------------------------------------------
+    # INGESTION
+    # ------------------------------------------------------------
+    def ingest(self, price_file) -> list:
+        """Add a daily price file; returns the Business Dates it added.
+
+        Dates already in the store are left untouched (append-only).
+        """
+        df = load_price_file(price_file, use_cache=False)
+        df = df.rename(columns={_detect_price_column(df): PRICE_COLUMN})
+
+        if "Business Date" in df.columns:
+            days = pd.to_datetime(df["Business Date"], errors="coerce").dt.strftime("%Y-%m-%d")
+        else:
+            days = pd.Series(get_price_date(df, Path(str(price_file)).name), index=df.index)
+        df = df.assign(_day=days).dropna(subset=["_day"])
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        symbols = self.symbols
+        added = []
+
+        for day, part in df.groupby("_day"):
+            if day in self.dates():
+                continue
+
+            part = part.drop_duplicates(subset="Symbol", keep="first")
+            for s in part["Symbol"]:
+                if s not in self._codes:
+                    self._codes[s] = len(symbols)
+                    symbols.append(s)
+
+            codes = np.array([self._codes[s] for s in part["Symbol"]], dtype="int32")
+            order = np.argsort(codes)
+            arrays = {"code": codes[order]}
+            for col in PRICE_COLUMNS:
+                if col in part.columns:
+                    arrays[col] = _numeric(part[col])[order]
+
+            atomic_write(self.root / f"date={day}.npz", lambda f: np.savez(f, **arrays))
+            added.append(day)
+
+        if added:
+            # dates.json last: a partition only becomes visible once the
+            # dictionary it references has been saved
+            atomic_write(self.root / "symbols.json", lambda f: f.write(json.dumps(symbols).encode()))
+            self._dates = sorted(set(self.dates()) | set(added))
+            atomic_write(self.root / "dates.json", lambda f: f.write(json.dumps(self._dates).encode()))
+
+        return added
+
+    # ------------------------------------------------------------
+    # LOOKUPS
+    # ------------------------------------------------------------
+    def partition(self, day: str) -> dict:
+        if day not in self._partitions:
+            with np.load(self.root / f"date={day}.npz") as z:
+                self._partitions[day] = {k: z[k] for k in z.files}
+        return self._partitions[day]
+
+    def price_array(self, date, column=PRICE_COLUMN, asof=True) -> np.ndarray:
+        """Dense float vector over the symbol dictionary (NaN = no quote)."""
+        part = self.partition(self.resolve_date(date, asof=asof))
+        out = np.full(len(self.symbols), np.nan)
+        if column in part:
+            out[part["code"]] = part[column]
+        return out
+
+    def price_vector(self, date, column=PRICE_COLUMN, asof=True) -> pd.Series:
+        """Prices for ``date`` as a Series indexed by symbol."""
+        prices = self.price_array(date, column=column, asof=asof)
+        s = pd.Series(prices, index=pd.Index(self.symbols, name="Symbol"), name=column)
+        return s.dropna()
+
+    def price_frame(self, date, asof=True) -> pd.DataFrame:
+        """A stored date shaped like a NEPSE price file (Symbol + price columns)."""
+        day = self.resolve_date(date, asof=asof)
+        part = self.partition(day)
+        df = pd.DataFrame({c: v for c, v in part.items() if c != "code"})
+        df.insert(0, "Symbol", np.asarray(self.symbols, dtype=object)[part["code"]])
+        df.insert(0, "Business Date", day)
+        return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NEPSE historical price store")
+    parser.add_argument("--store", default=str(STORE_DIR), help="store directory")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    ing = sub.add_parser("ingest", help="add daily price CSV files")
+    ing.add_argument("files", nargs="+", help="files or glob patterns")
+    sub.add_parser("list", help="show stored dates")
+
+    args = parser.parse_args(argv)
+    store = PriceStore(args.store)
+
+    if args.cmd == "ingest":
+        files = sorted({f for pattern in args.files for f in glob.glob(pattern)})
+        for f in files:
+            added = store.ingest(f)
+            print(f"{Path(f).name}: {', '.join(added) if added else 'already stored'}")
+    else:
+        for day in store.dates():
+            print(day)
+        print(f"{len(store.dates())} dates, {len(store.symbols)} symbols")
+
+
+if __name__ == "__main__":
+    main()
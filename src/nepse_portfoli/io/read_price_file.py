@@ -1,32 +1,78 @@
-import pandas as pd
-import streamlit as st
+# NEPSE "Today's Price" reader shared by every caller (app, CLI, batch,
+# price store)
+#
+# CSVs go through pandas' C engine with explicit dtypes for the known NEPSE
+# columns, keeping only the columns the app uses.  Lines the parser has to skip
+# (wrong field count) and numeric cells that do not parse are not dropped
+# silently: they are listed in ``df.attrs["price_file_issues"]`` and logged.
+import csv
+import logging
+import re
+import warnings
 from pathlib import Path
 
+import pandas as pd
+
+from nepse_portfoli.io.parsed_cache import parsed_cache
+
+
+log = logging.getLogger(__name__)
+
+
+# bump when the parse result changes (part of the parse-cache key)
+PRICE_KIND = "price_file/v2"
+
+TEXT_COLUMNS = ["Business Date", "Symbol", "Security Name"]
+NUMERIC_COLUMNS = [
+    "Open Price",
+    "High Price",
+    "Low Price",
+    "Close Price",
+    "Last Updated Price",
+    "Last Updated price",
+    "Previous Day Close Price",
+    "Total Traded Quantity",
+    "Total Traded Value",
+    "Total Trades",
+    "Average Traded Price",
+    "Fifty Two Week High",
+    "Fifty Two Week Low",
+    "Market Capitalization",
+]
+
+# what the summaries, report and price store read; None = every column
+USED_COLUMNS = TEXT_COLUMNS + NUMERIC_COLUMNS
 
-def load_price_file(file):
+
+def load_price_file(file, use_cache=True, columns=USED_COLUMNS):
     if file is None:
         return None
 
-    # --- HANDLE BOTH UploadedFile AND NORMAL PATH ---
+    if not use_cache:
+        return _read_price_file(file, columns)
+
+    return parsed_cache.load(
+        file, PRICE_KIND, lambda: _read_price_file(file, columns),
+        columns=columns,
+    )
+
+
+def _file_name(file) -> str:
     if hasattr(file, "name"):
-        fname = file.name.lower()
-        path = file
-    else:
-        path = str(file)
-        fname = Path(path).name.lower()
+        return str(file.name)
+    return Path(str(file)).name
+
+
+def _read_price_file(file, columns=USED_COLUMNS):
+    # --- HANDLE BOTH UploadedFile AND NORMAL PATH ---
+    path = file if hasattr(file, "read") else str(file)
 
     # --- READ FILE ---
-    if fname.endswith(".csv"):
-        df = pd.read_csv(
-            path,
-            engine="python",
-            on_bad_lines="skip"
-        )
+    if _file_name(file).lower().endswith(".csv"):
+        df, issues = read_price_csv(path, columns)
     else:
-        df = pd.read_excel(path)
-
-    # --- CLEAN COLUMNS ---
-    df.columns = [c.strip() for c in df.columns]
+        df, issues = pd.read_excel(path), []
+        df.columns = [str(c).strip() for c in df.columns]
 
     if "Symbol" not in df.columns:
         raise ValueError("Price file must contain 'Symbol' column")
@@ -37,4 +83,92 @@ def load_price_file(file):
         .str.upper()
     )
 
+    if issues:
+        log.warning("%s: %d price-file issue(s)", _file_name(file), len(issues))
+        for issue in issues[:10]:
+            log.warning("  %s", issue)
+    df.attrs["price_file_issues"] = issues
     return df
+
+
+def _header(path) -> list:
+    """Column names from the first line (cheaper than a pandas nrows=0 read)."""
+    if hasattr(path, "read"):
+        path.seek(0)
+        line = path.readline()
+        path.seek(0)
+    else:
+        with open(path, "rb") as f:
+            line = f.readline()
+
+    if isinstance(line, bytes):
+        line = line.decode("utf-8-sig")
+    return next(csv.reader([line.lstrip("\ufeff")]))
+
+
+def read_price_csv(path, columns=USED_COLUMNS):
+    """(frame, issues) for a NEPSE price CSV, read with the C engine.
+
+    ``columns`` limits the read to those (whitespace-trimmed) headers.
+    ``issues`` lists skipped lines and numeric cells that did not parse.
+    """
+    # header first, so dtypes can be keyed on the raw column names
+    header = _header(path)
+
+    raw = {c: str(c).strip() for c in header}
+    wanted = [c for c in header if columns is None or raw[c] in columns]
+    numeric = [c for c in wanted if raw[c] in NUMERIC_COLUMNS]
+    dtype = {c: "float64" for c in numeric}
+    dtype.update({c: str for c in wanted if raw[c] not in NUMERIC_COLUMNS})
+
+    def read(dtype):
+        if hasattr(path, "seek"):
+            path.seek(0)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", pd.errors.ParserWarning)
+            # no usecols here: with usecols the C parser stops checking the
+            # field count, and an unquoted comma in a Security Name would
+            # shift that row's prices instead of being reported
+            df = pd.read_csv(
+                path,
+                engine="c",
+                dtype=dtype,
+                thousands=",",
+                on_bad_lines="warn",
+            )[wanted]
+        skipped = [
+            line.strip()
+            for w in caught if issubclass(w.category, pd.errors.ParserWarning)
+            for line in str(w.message).splitlines() if line.strip()
+        ]
+        return df, skipped
+
+    try:
+        df, issues = read(dtype)
+    except ValueError:
+        # a numeric column holds text: read it as text and coerce per cell
+        df, issues = read({c: str for c in wanted})
+        for c in numeric:
+            parsed = pd.to_numeric(df[c].str.replace(",", "", regex=False), errors="coerce")
+            bad = parsed.isna() & df[c].notna()
+            for i in df.index[bad]:
+                issues.append(f"row {i + 1}: {raw[c]}={df.at[i, c]!r} is not a number")
+            df[c] = parsed
+
+    if hasattr(path, "seek"):
+        path.seek(0)
+    df.columns = [raw[c] for c in df.columns]
+    return df, issues
+
+
+def get_price_date(price_df: pd.DataFrame, filename: str = "") -> str:
+    """Business date of a NEPSE price file, else the date in its file name."""
+    try:
+        if "Business Date" in price_df.columns:
+            raw = price_df["Business Date"].dropna().iloc[0]
+        else:
+            raw = price_df.iloc[1, 1]
+        return pd.to_datetime(raw, errors="coerce").strftime("%Y-%m-%d")
+    except Exception:
+        m = re.search(r"\d{4}-\d{2}-\d{2}", filename)
+        return m.group(0) if m else "Unknown"
@@ -0,0 +1,174 @@
+# one symbol -> sector map per process
+#
+# Sectors come from two places: data/Sector_info.csv (tab-separated, ships
+# with the repo) and the optional "Sector info" sheet of a user's journal
+# workbook.  The registry reads each source once, re-reads it only when the
+# file's mtime/size changes (uploads: when their content hash changes), and
+# merges them with a fixed precedence: the workbook's own sheet wins, the
+# CSV fills the symbols it does not list.  The workbook sheet also goes
+# through the parse cache (keyed by the workbook digest, "no such sheet"
+# included), so a new process does not reopen a workbook it has seen.  The merged map is a frame with
+# one row per canonical symbol and categorical Sector/Source columns, so
+# every summary in the process shares the same in-memory map.
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from nepse_portfoli.config.paths import SECTOR_INFO_FILE
+from nepse_portfoli.core.symbols import normalize_symbol
+from nepse_portfoli.io.parsed_cache import file_digest, parsed_cache
+
+
+SECTOR_SHEET = "Sector info"
+# parse-cache kind of the workbook's sector sheet
+SECTOR_SHEET_KIND = "sector_sheet/v1"
+
+# earlier sources win when both map a symbol
+PRECEDENCE = ("workbook", "csv")
+
+# parsed sources (one per CSV path / upload digest) kept, least recently used dropped
+MAX_SOURCES = 4
+# merged maps kept for different (csv, workbook) combinations
+MAX_MERGED = 8
+
+
+def _clean(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.dropna(subset=["Symbol", "Sector"])
+    df = pd.DataFrame({
+        "Symbol": normalize_symbol(df["Symbol"]),
+        "Sector": df["Sector"].astype(str).str.strip(),
+    })
+    df = df[(df["Symbol"] != "") & (df["Sector"] != "")]
+    return df.drop_duplicates(subset="Symbol", keep="first").reset_index(drop=True)
+
+
+def read_sector_csv(path) -> pd.DataFrame:
+    return _clean(pd.read_csv(path, sep="\t", dtype=str))
+
+
+def read_sector_sheet(workbook, missing_ok=True) -> pd.DataFrame:
+    """The workbook's "Sector info" sheet; empty when it has none.
+
+    With ``missing_ok=False`` a workbook without the sheet raises ValueError.
+
+    Columns are taken by name (Symbol/Sector) when present, otherwise the
+    sheet's B:C like the original layout.
+    """
+    if hasattr(workbook, "seek"):
+        workbook.seek(0)
+    try:
+        df = pd.read_excel(workbook, sheet_name=SECTOR_SHEET)
+    except ValueError:  # no such sheet
+        if not missing_ok:
+            raise
+        return pd.DataFrame(columns=["Symbol", "Sector"])
+    finally:
+        if hasattr(workbook, "seek"):
+            workbook.seek(0)
+
+    df.columns = [str(c).strip() for c in df.columns]
+    if not {"Symbol", "Sector"} <= set(df.columns):
+        cols = list(df.columns)[1:3] if df.shape[1] >= 3 else list(df.columns)[:2]
+        if len(cols) != 2:
+            raise ValueError(f"'{SECTOR_SHEET}' sheet should have 2 columns, but has: {list(df.columns)}")
+        df = df[cols].set_axis(["Symbol", "Sector"], axis=1)
+
+    return _clean(df)
+
+
+def load_sector_sheet(workbook, use_cache=True) -> pd.DataFrame:
+    """``read_sector_sheet`` served from the parse cache; an empty result is cached too."""
+    if not use_cache:
+        return read_sector_sheet(workbook)
+
+    return parsed_cache.load(
+        workbook, SECTOR_SHEET_KIND,
+        lambda: read_sector_sheet(workbook),
+        sheet=SECTOR_SHEET,
+    )
+
+
+def _identity(source) -> tuple:
+    """(id, version): path + mtime/size, or content hash for uploads."""
+    if hasattr(source, "read"):
+        digest = file_digest(source)
+        return digest, digest
+    st = os.stat(source)
+    return str(Path(source).resolve()), (st.st_mtime_ns, st.st_size)
+
+
+class SectorRegistry:
+    def __init__(self):
+        self._sources = {}  # (kind, id) -> (version, frame), least recently used first
+        self._merged = {}   # source tokens -> merged frame, oldest first
+        # the Streamlit server runs sessions on threads that share this registry
+        self._lock = threading.Lock()
+
+    def _source(self, kind: str, source, read) -> tuple:
+        # caller holds self._lock
+        ident, version = _identity(source)
+        key = (kind, ident)
+
+        cached = self._sources.pop(key, None)
+        if cached is None or cached[0] != version:
+            cached = (version, read(source))
+        self._sources[key] = cached  # most recently used last
+        while len(self._sources) > MAX_SOURCES:
+            self._sources.pop(next(iter(self._sources)))
+        return (key, version), cached[1]
+
+    def load(self, csv=SECTOR_INFO_FILE, workbook=None) -> pd.DataFrame:
+        """Merged map: Symbol, Sector (categorical), Source ("workbook"/"csv")."""
+        with self._lock:
+            parts = {}
+            tokens = []
+            if csv is not None:
+                token, parts["csv"] = self._source("csv", csv, read_sector_csv)
+                tokens.append(token)
+            if workbook is not None:
+                token, parts["workbook"] = self._source("workbook", workbook, load_sector_sheet)
+                tokens.append(token)
+
+            key = tuple(tokens)
+            if key not in self._merged:
+                frames = [
+                    parts[name].assign(Source=name)
+                    for name in PRECEDENCE if name in parts
+                ]
+                merged = (
+                    pd.concat(frames, ignore_index=True)
+                    .drop_duplicates(subset="Symbol", keep="first")
+                    .sort_values("Symbol", ignore_index=True)
+                )
+                merged["Sector"] = merged["Sector"].astype("category")
+                merged["Source"] = pd.Categorical(merged["Source"], categories=list(PRECEDENCE))
+                self._merged[key] = merged
+                while len(self._merged) > MAX_MERGED:
+                    self._merged.pop(next(iter(self._merged)))
+            return self._merged[key]
+
+    def conflicts(self, csv=SECTOR_INFO_FILE, workbook=None) -> pd.DataFrame:
+        """Symbols the CSV and the workbook sheet put in different sectors."""
+        if csv is None or workbook is None:
+            return pd.DataFrame(columns=["Symbol", "Sector_csv", "Sector_workbook"])
+        with self._lock:
+            _, a = self._source("csv", csv, read_sector_csv)
+            _, b = self._source("workbook", workbook, load_sector_sheet)
+        both = a.merge(b, on="Symbol", suffixes=("_csv", "_workbook"))
+        return both[both["Sector_csv"] != both["Sector_workbook"]].reset_index(drop=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sources.clear()
+            self._merged.clear()
+
+
+def unmapped_symbols(symbols, sector_df: pd.DataFrame) -> list:
+    """Sorted canonical ``symbols`` that ``sector_df`` has no sector for."""
+    mapped = set(normalize_symbol(sector_df["Symbol"]))
+    return sorted(set(normalize_symbol(pd.Series(symbols))) - mapped)
+
+
+sector_registry = SectorRegistry()
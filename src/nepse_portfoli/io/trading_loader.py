@@ -1,11 +1,89 @@
 import pandas as pd
-import requests
 
-from urllib.parse import urlparse, unquote
-from pathlib import Path
-import tempfile
+from nepse_portfoli.io.parsed_cache import parsed_cache, file_digest
+# URL helpers used to live here; re-exported for existing imports
+from nepse_portfoli.io.data_sources import short_name, download_to_temp
 
-def load_trading_sheet(path, sheet="Keshav"):
+
+# parser name + options that make up the parse-cache key of a sheet
+SHEET_KIND = "trading_sheet/v1"
+SHEET_PARAMS = {"header": 3, "usecols": "B:O"}
+# which sheets of a workbook are journals (load_trading_sheets(sheets=None))
+SHEETS_KIND = "trading_sheet_names/v1"
+
+
+def load_trading_sheet(path, sheet="Keshav", use_cache=True):
+    if not use_cache:
+        return _read_trading_sheet(path, sheet)
+
+    return parsed_cache.load(
+        path, SHEET_KIND,
+        lambda: _read_trading_sheet(path, sheet),
+        sheet=sheet, **SHEET_PARAMS,
+    )
+
+
+def load_trading_sheets(path, sheets=None, use_cache=True) -> dict:
+    """{sheet name: journal frame}, opening the workbook at most once.
+
+    ``sheets=None`` means every sheet laid out like a trading journal; that
+    list is cached too, so a known workbook is not opened just to find it.
+    Sheets already in the parse cache are not re-read.
+    """
+    digest = file_digest(path) if use_cache else None
+    names_key = parsed_cache.key(digest, SHEETS_KIND, **SHEET_PARAMS) if use_cache else None
+    out = {}
+
+    wanted = sheets
+    if use_cache and sheets is None:
+        names = parsed_cache.get(names_key)
+        if names is not None:
+            wanted = names["sheet"].tolist()
+
+    if use_cache and wanted is not None:
+        for sheet in wanted:
+            df = parsed_cache.get(parsed_cache.key(digest, SHEET_KIND, sheet=sheet, **SHEET_PARAMS))
+            if df is not None:
+                out[sheet] = df
+        if len(out) == len(wanted):
+            return out
+
+    scan = wanted is None
+    with pd.ExcelFile(path) as xl:
+        if scan:
+            wanted = xl.sheet_names
+        for sheet in wanted:
+            if sheet in out:
+                continue
+
+            try:
+                df = _read_trading_sheet(xl, sheet)
+            except ValueError:
+                if not scan:
+                    raise
+                continue  # too short to be a journal
+
+            if scan and not {"Symbol", "position"} <= set(df.columns):
+                continue  # e.g. a "Sector info" sheet
+
+            out[sheet] = df
+            if use_cache:
+                try:
+                    parsed_cache.put(parsed_cache.key(digest, SHEET_KIND, sheet=sheet, **SHEET_PARAMS), df)
+                except OSError:
+                    pass  # caching is best effort
+
+    # keep the requested order
+    out = {sheet: out[sheet] for sheet in wanted if sheet in out}
+    if use_cache and scan:
+        try:
+            parsed_cache.put(names_key, pd.DataFrame({"sheet": list(out)}, dtype=object))
+        except OSError:
+            pass
+    return out
+
+
+def _read_trading_sheet(path, sheet):
     df = pd.read_excel(
         path,
         sheet_name=sheet,
@@ -35,22 +113,3 @@ def load_trading_sheet(path, sheet="Keshav"):
 #     No branching needed — pandas handles both.
 #     """
 #     return pd.read_csv(source, header=None)
-
-def short_name(source):
-    parsed = urlparse(str(source))
-
-    if parsed.scheme:   # it's a URL
-        return Path(unquote(parsed.path)).name
-
-    return Path(str(source)).name
-
-
-
-def download_to_temp(url):
-    r = requests.get(url)
-    r.raise_for_status()
-    suffix = Path(url).suffix
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    tmp.write(r.content)
-    tmp.seek(0)
-    return tmp
@@ -0,0 +1,40 @@
+# run the tests against src/ without installing, with a throwaway cache dir
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+os.environ.setdefault("NEPSE_CACHE_DIR", tempfile.mkdtemp(prefix="nepse-test-cache-"))
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+
+# Last Updated Price per stored date, for the ``store`` fixture
+PRICES = {
+    "2025-12-14": {"NABIL": 492.0, "NIMB": 190.8},
+    "2025-12-21": {"NABIL": 500.0, "NIMB": 195.0},
+    "2025-12-24": {"NABIL": 510.0, "NIMB": 193.0},
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A PriceStore holding PRICES, ingested from daily CSVs."""
+    from nepse_portfoli.io.price_store import PriceStore
+
+    store = PriceStore(tmp_path / "store")
+    for day, prices in PRICES.items():
+        path = tmp_path / f"Today's Price - {day}.csv"
+        pd.DataFrame({
+            "Business Date": day,
+            "Symbol": list(prices),
+            "Last Updated Price": list(prices.values()),
+        }).to_csv(path, index=False)
+        store.ingest(path)
+    return store
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from nepse_portfoli.core.snapshot import PortfolioSnapshot
+from nepse_portfoli.io.export import export_summaries
+
+from conftest import PRICES
+
+pa = pytest.importorskip("pyarrow")
+
+
+def test_history_export_with_late_starting_journal(store, tmp_path):
+    # opened after the first stored date: the first chunk has no symbol rows
+    journal = pd.DataFrame({
+        "Symbol": ["NABIL", "NIMB"],
+        "position": ["o", "o"],
+        "Buy price": [480.0, 200.0],
+        "Total holding": [10, 20],
+        "Open date": ["2025-12-20", "2025-12-22"],
+    })
+    snapshot = PortfolioSnapshot(journal, store.price_frame("2025-12-24"))
+
+    paths = export_summaries(
+        snapshot, tmp_path / "export", formats=("parquet", "arrow"),
+        store=store, chunk_dates=1,
+    )
+
+    by_symbol = pd.read_parquet(paths["valuation_by_symbol.parquet"])
+    assert sorted(by_symbol["Symbol"].unique()) == ["NABIL", "NIMB"]
+    assert pa.ipc.open_file(paths["valuation_by_symbol.arrow"]).read_all().num_rows == len(by_symbol)
+
+    totals = pd.read_parquet(paths["valuation_totals.parquet"])
+    assert len(totals) == len(PRICES)
+    assert totals["Market_Value_NPR"].iloc[-1] == pytest.approx(10 * 510 + 20 * 193)
+
+
+def test_all_empty_table_is_written_header_only(tmp_path):
+    journal = pd.DataFrame({
+        "Symbol": ["NABIL"], "position": ["o"],
+        "Buy price": [480.0], "Total holding": [10],
+    })
+    paths = export_summaries(PortfolioSnapshot(journal), tmp_path, formats=("parquet",))
+
+    realized = pd.read_parquet(paths["realized_summary.parquet"])
+    assert realized.empty
+    assert len(realized.columns)
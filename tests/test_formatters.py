@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from nepse_portfoli.core.formatters import (
+    SYMBOL_SUMMARY_FORMATS,
+    fmt_int,
+    fmt_pct,
+    format_frame,
+)
+
+
+def test_fmt_int():
+    s = pd.Series([1234.6, 0, -2500.2, -0.4, np.nan, None])
+    assert fmt_int(s).tolist() == ["1,235", "0", "-2,500", "0", "", ""]
+
+
+def test_fmt_pct():
+    s = pd.Series([0.1234, 0, -0.05, np.nan])
+    assert fmt_pct(s).tolist() == ["12.34%", "0.00%", "-5.00%", ""]
+
+
+def test_format_frame_only_touches_listed_columns():
+    df = pd.DataFrame({"Symbol": ["NABIL"], "PL": [-1500.0], "PL%": [-0.1]})
+    out = format_frame(df, SYMBOL_SUMMARY_FORMATS)
+
+    assert out.loc[0, "Symbol"] == "NABIL"
+    assert out.loc[0, "PL"] == "-1,500"
+    assert out.loc[0, "PL%"] == "-10.00%"
+    assert df.loc[0, "PL"] == -1500.0  # input left numeric
+
+
+def test_pdf_formats_follow_the_renamed_columns():
+    from nepse_portfoli.app.make_report_pdf import PDF_COLUMNS, PDF_FORMATS
+
+    summary = pd.DataFrame({
+        "sn": [1, 2],
+        "Symbol": ["NABIL", "NIMB"],
+        "Total Kitta": [10.0, 0.0],
+        "Current share Price": [492.0, np.nan],
+        "Buy share price": [480.0, np.nan],
+        "Investment_NPR": [4800.0, 0.0],
+        "Market_Value_NPR": [4920.0, 0.0],
+        "PL": [120.0, -0.2],
+        "PL%": [0.025, np.nan],
+        "Sector": ["Banks", "Banks"],
+    })
+    table = summary.rename(columns=PDF_COLUMNS)
+    cells = format_frame(table, PDF_FORMATS).fillna("")
+
+    assert set(PDF_FORMATS) <= set(table.columns)
+    assert cells["Current Price"].tolist() == ["492", ""]
+    assert cells["P/L (NPR)"].tolist() == ["120", "0"]
+    assert cells["PL%"].tolist() == ["2.50%", ""]
+    assert cells["SN"].tolist() == [1, 2]
+
+
+def test_sector_and_realized_formats():
+    from nepse_portfoli.core.formatters import REALIZED_FORMATS, SECTOR_SUMMARY_FORMATS
+
+    sector = pd.DataFrame({"Sector": ["Banks"], "PL": [-0.0], "Allocation%": [np.nan]})
+    out = format_frame(sector, SECTOR_SUMMARY_FORMATS)
+    assert out.loc[0, "PL"] == "0" and out.loc[0, "Allocation%"] == ""
+
+    realized = pd.DataFrame({"Realized_Profit_NPR": [-1234.4, 0.0]})
+    assert format_frame(realized, REALIZED_FORMATS)["Realized_Profit_NPR"].tolist() == ["-1,234", "0"]
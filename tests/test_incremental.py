@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nepse_portfoli.core.incremental import IncrementalPortfolio
+from nepse_portfoli.core.snapshot import PortfolioSnapshot
+
+
+JOURNAL = pd.DataFrame({
+    "Symbol": ["NABIL", "NABIL", "NIMB", "SCB", "SCB"],
+    "position": ["o", "c", "o", "o", "c"],
+    "Buy price": [480.0, 470.0, 200.0, 600.0, 610.0],
+    "Sell price": [None, 500.0, None, None, 640.0],
+    "Total holding": [10, 5, 20, 4, 6],
+    "Open date": ["2025-11-01", "2025-11-02", "2025-11-03", "2025-11-04", "2025-11-05"],
+    "Closed date": [None, "2025-12-01", None, None, "2025-12-02"],
+})
+SECTORS = pd.DataFrame({
+    "Symbol": ["NABIL", "NIMB", "SCB"],
+    "Sector": ["Commercial Banks"] * 3,
+})
+
+
+def _prices(**prices):
+    base = {"NABIL": 492.0, "NIMB": 190.8, "SCB": 623.9}
+    base.update(prices)
+    return pd.DataFrame({"Symbol": list(base), "Last Updated Price": list(base.values())})
+
+
+def assert_matches_rebuild(summaries, journal, price_df):
+    full = PortfolioSnapshot(journal, price_df, SECTORS)
+    for view in ("symbol_summary", "sector_summary", "realized_summary"):
+        assert_frame_equal(
+            getattr(summaries, view)().reset_index(drop=True),
+            getattr(full, view)().reset_index(drop=True),
+            check_dtype=False,
+        )
+    assert np.allclose(list(summaries.totals().values()), list(full.totals().values()))
+
+
+@pytest.fixture
+def portfolio(tmp_path):
+    inc = IncrementalPortfolio("test", root=tmp_path)
+    inc.update(JOURNAL, _prices(), SECTORS)
+    return inc
+
+
+def test_unchanged_run_recomputes_nothing(portfolio):
+    summaries = portfolio.update(JOURNAL, _prices(), SECTORS)
+    assert summaries.recomputed == []
+    assert_matches_rebuild(summaries, JOURNAL, _prices())
+
+
+def test_price_change_matches_full_rebuild(portfolio):
+    prices = _prices(NIMB=210.0)
+    summaries = portfolio.update(JOURNAL, prices, SECTORS)
+    assert summaries.recomputed == ["NIMB"]
+    assert_matches_rebuild(summaries, JOURNAL, prices)
+
+
+def test_lot_removal_matches_full_rebuild(portfolio):
+    journal = JOURNAL.drop(index=[4])  # SCB's closed lot
+    summaries = portfolio.update(journal, _prices(), SECTORS)
+    assert summaries.recomputed == ["SCB"]
+    assert_matches_rebuild(summaries, journal, _prices())
+
+
+def test_removed_symbol_drops_out(portfolio):
+    journal = JOURNAL[JOURNAL["Symbol"] != "NIMB"]
+    summaries = portfolio.update(journal, _prices(), SECTORS)
+    assert "NIMB" not in summaries.symbol_summary()["Symbol"].tolist()
+    assert_matches_rebuild(summaries, journal, _prices())
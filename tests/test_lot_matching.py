@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+from nepse_portfoli.core.snapshot import PortfolioSnapshot
+
+
+def _snapshot(rows, prices):
+    journal = pd.DataFrame(
+        rows, columns=["Symbol", "position", "Buy price", "Sell price",
+                       "Total holding", "Open date", "Closed date"],
+    )
+    price_df = pd.DataFrame({"Symbol": list(prices), "Last Updated Price": list(prices.values())})
+    return PortfolioSnapshot(journal, price_df)
+
+
+@pytest.fixture
+def snapshot():
+    # AAA: the newer lot is the one the journal marks as sold.
+    # BBB: a 5-share sale out of 15 held, i.e. part of the oldest lot.
+    return _snapshot([
+        ["AAA", "o", 100.0, None, 10, "2025-01-01", None],
+        ["AAA", "c", 120.0, 130.0, 10, "2025-02-01", "2025-03-01"],
+        ["BBB", "o", 50.0, None, 10, "2025-01-01", None],
+        ["BBB", "c", 60.0, 90.0, 5, "2025-02-01", "2025-03-01"],
+    ], {"AAA": 150.0, "BBB": 70.0})
+
+
+def _by_symbol(snapshot, method):
+    return snapshot.lot_match(method).by_symbol.set_index("Symbol")
+
+
+def test_journal_view_prices_each_sale_against_its_own_row(snapshot):
+    realized = snapshot.realized_summary().set_index("Symbol")["Realized_Profit_NPR"]
+    assert realized["AAA"] == pytest.approx((130 - 120) * 10)
+    assert realized["BBB"] == pytest.approx((90 - 60) * 5)
+
+
+def test_fifo_sells_the_oldest_shares_first(snapshot):
+    m = _by_symbol(snapshot, "fifo")
+
+    # AAA: the 10 sold are the 2025-01-01 lot at 100
+    assert m.loc["AAA", "Realized_PL"] == pytest.approx(10 * 130 - 10 * 100)
+    assert m.loc["AAA", "Held_Kitta"] == 10
+    assert m.loc["AAA", "Cost_Basis_NPR"] == pytest.approx(10 * 120)
+    assert m.loc["AAA", "Unrealized_PL"] == pytest.approx(10 * 150 - 10 * 120)
+
+    # BBB: 5 of the 10 at 50 sold; 5 at 50 and 5 at 60 left
+    assert m.loc["BBB", "Realized_PL"] == pytest.approx(5 * 90 - 5 * 50)
+    assert m.loc["BBB", "Held_Kitta"] == 10
+    assert m.loc["BBB", "Cost_Basis_NPR"] == pytest.approx(5 * 50 + 5 * 60)
+    assert m.loc["BBB", "Avg_Cost"] == pytest.approx(55)
+
+
+def test_average_sells_at_the_running_average_cost(snapshot):
+    m = _by_symbol(snapshot, "average")
+
+    # AAA: 20 held at 2200 -> average 110 when the 10 are sold
+    assert m.loc["AAA", "Realized_PL"] == pytest.approx((130 - 110) * 10)
+    assert m.loc["AAA", "Cost_Basis_NPR"] == pytest.approx(10 * 110)
+    assert m.loc["AAA", "Unrealized_PL"] == pytest.approx(10 * 150 - 10 * 110)
+
+    # BBB: 15 held at 800 -> average 160/3 when the 5 are sold
+    avg = 800 / 15
+    assert m.loc["BBB", "Realized_PL"] == pytest.approx((90 - avg) * 5)
+    assert m.loc["BBB", "Cost_Basis_NPR"] == pytest.approx(800 - 5 * avg)
+    assert m.loc["BBB", "Avg_Cost"] == pytest.approx(avg)
+
+
+def test_realized_method_switches_the_realized_summary():
+    rows = [
+        ["AAA", "o", 100.0, None, 10, "2025-01-01", None],
+        ["AAA", "c", 120.0, 130.0, 10, "2025-02-01", "2025-03-01"],
+    ]
+    journal = pd.DataFrame(rows, columns=["Symbol", "position", "Buy price", "Sell price",
+                                          "Total holding", "Open date", "Closed date"])
+    for method, expected in [(None, 100.0), ("fifo", 300.0), ("average", 200.0)]:
+        realized = PortfolioSnapshot(journal, realized_method=method).realized_summary()
+        assert realized["Realized_Profit_NPR"].sum() == pytest.approx(expected)
@@ -0,0 +1,85 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from nepse_portfoli.io.parsed_cache import ParsedFileCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParsedFileCache(tmp_path / "parsed")
+
+
+class Parser:
+    """Counts calls; returns a frame built from the source's bytes."""
+
+    def __init__(self, source):
+        self.source = source
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        data = self.source.read() if hasattr(self.source, "read") else self.source.read_bytes()
+        return pd.DataFrame({"raw": [data]})
+
+
+def test_same_bytes_hit_under_any_name(cache, tmp_path):
+    a, b = tmp_path / "a.csv", tmp_path / "renamed.csv"
+    a.write_bytes(b"NABIL,492")
+    b.write_bytes(b"NABIL,492")
+
+    first = Parser(a)
+    df = cache.load(a, "test/v1", first)
+    again = Parser(b)
+    assert cache.load(b, "test/v1", again).equals(df)
+    upload = Parser(io.BytesIO(b"NABIL,492"))
+    assert cache.load(upload.source, "test/v1", upload).equals(df)
+
+    assert (first.calls, again.calls, upload.calls) == (1, 0, 0)
+
+
+def test_changed_bytes_or_options_miss(cache, tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_bytes(b"NABIL,492")
+    parse = Parser(path)
+    cache.load(path, "test/v1", parse)
+
+    path.write_bytes(b"NABIL,500")  # same name, new content
+    assert cache.load(path, "test/v1", parse)["raw"][0] == b"NABIL,500"
+    cache.load(path, "test/v1", parse, sheet="other")
+    cache.load(path, "test/v2", parse)
+
+    assert parse.calls == 4
+
+
+def test_eviction_keeps_the_most_recently_used(tmp_path):
+    cache = ParsedFileCache(tmp_path / "parsed", max_entries=2)
+    frames = {k: pd.DataFrame({"v": [k]}) for k in ("a", "b", "c")}
+
+    cache.put("a", frames["a"])
+    cache.put("b", frames["b"])
+    # mtime is the LRU clock: "a" is older, until reading it touches it
+    os.utime(cache.root / "a.pkl", (1, 1))
+    os.utime(cache.root / "b.pkl", (2, 2))
+    assert cache.get("a") is not None
+    cache.put("c", frames["c"])
+
+    assert cache.get("b") is None
+    assert cache.get("a").equals(frames["a"])
+    assert cache.get("c").equals(frames["c"])
+
+
+def test_eviction_respects_the_byte_budget(tmp_path):
+    cache = ParsedFileCache(tmp_path / "parsed", max_bytes=1)
+    cache.put("big", pd.DataFrame({"v": range(1000)}))
+    assert cache.get("big") is None
+    assert list((tmp_path / "parsed").glob("*.pkl")) == []
+
+
+def test_unreadable_entry_is_dropped(cache):
+    cache.put("k", pd.DataFrame({"v": [1]}))
+    (cache.root / "k.pkl").write_bytes(b"truncated")
+    assert cache.get("k") is None
+    assert not (cache.root / "k.pkl").exists()
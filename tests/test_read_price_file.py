@@ -0,0 +1,60 @@
+import glob
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from nepse_portfoli.io.read_price_file import read_price_csv
+
+DATA = Path(__file__).parent / "data"
+REPO_DATA = Path(__file__).resolve().parents[1] / "data"
+
+
+def _old_reader(path):
+    # the reader read_price_csv replaced: python engine, bad lines dropped
+    df = pd.read_csv(path, engine="python", on_bad_lines="skip")
+    df.columns = [c.strip() for c in df.columns]
+    return df
+
+
+def test_bad_line_is_skipped_and_reported():
+    df, issues = read_price_csv(DATA / "price_bad_line.csv")
+
+    # NIMB's unquoted comma gives it an extra field
+    assert df["Symbol"].tolist() == ["NABIL", "SCB", "HDL"]
+    assert len(issues) == 1
+    assert "line 3" in issues[0] and "saw 8" in issues[0]
+
+    assert df["Last Updated Price"].tolist() == [492.0, 623.9, 1200.0]
+    assert df["Total Traded Quantity"].tolist() == [78979.0, 1200.0, 850.0]
+
+
+def test_text_in_a_numeric_column_is_reported_per_cell(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text(
+        "Business Date,Symbol,Last Updated Price\n"
+        "2025-12-14,NABIL,492\n"
+        "2025-12-14,NIMB,halted\n"
+    )
+    df, issues = read_price_csv(path)
+
+    assert df["Last Updated Price"].tolist()[0] == 492.0
+    assert pd.isna(df["Last Updated Price"].iloc[1])
+    assert issues == ["row 2: Last Updated Price='halted' is not a number"]
+
+
+@pytest.mark.parametrize(
+    "path",
+    [DATA / "price_bad_line.csv", *sorted(glob.glob(str(REPO_DATA / "Today's Price - *.csv")))],
+    ids=lambda p: Path(p).name,
+)
+def test_rows_match_the_old_reader(path):
+    df, _ = read_price_csv(path, columns=None)
+    old = _old_reader(path)
+
+    assert len(df) == len(old)
+    assert df["Symbol"].tolist() == old["Symbol"].tolist()
+    assert df["Last Updated Price"].tolist() == pytest.approx(
+        pd.to_numeric(old["Last Updated Price"].astype(str).str.replace(",", ""), errors="coerce").tolist(),
+        nan_ok=True,
+    )
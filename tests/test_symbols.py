@@ -0,0 +1,33 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from nepse_portfoli.core.symbols import SymbolIndex
+
+
+def test_codes_follow_sorted_symbols_and_unknown_is_minus_one():
+    index = SymbolIndex([" nabil", "SCB ", "NIMB", "nabil"])
+    assert index.symbols.tolist() == ["NABIL", "NIMB", "SCB"]
+    assert index.codes(["scb", "Nabil", "UPPER", "NIMB"]).tolist() == [2, 0, -1, 1]
+
+
+def test_align_reorders_and_fills_missing():
+    index = SymbolIndex(["NABIL", "NIMB", "SCB"])
+    # price-file order, a symbol the journal lacks, a duplicate, and no NIMB
+    prices = pd.DataFrame({"Symbol": ["SCB", "HDL", " nabil", "SCB"]})
+    out = index.align(prices, [623.9, 1200.0, 492.0, 1.0])
+
+    assert out[0] == 492.0 and out[2] == 623.9  # first row wins for SCB
+    assert np.isnan(out[1])
+
+    sectors = index.align(pd.DataFrame({"Symbol": ["NIMB"]}), ["Banks"])
+    assert sectors.tolist() == [None, "Banks", None]
+
+
+def test_unknown_symbols_do_not_warn():
+    index = SymbolIndex(["NABIL"])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert index.codes(["NABIL", "NOT_LISTED"]).tolist() == [0, -1]
+        index.align(pd.DataFrame({"Symbol": ["NOT_LISTED", "NABIL"]}), [1.0, 2.0])
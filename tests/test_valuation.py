@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nepse_portfoli.core.valuation import value_portfolio_over_time
+
+
+JOURNAL = pd.DataFrame({
+    "Symbol": ["NABIL", "NIMB", "NABIL"],
+    "position": ["o", "o", "c"],
+    "Buy price": [480.0, 200.0, 450.0],
+    "Sell price": [None, None, 505.0],
+    "Total holding": [10, 20, 4],
+    "Open date": ["2025-12-01", "2025-12-20", "2025-12-01"],
+    "Closed date": [None, None, "2025-12-22"],
+})
+SECTORS = pd.DataFrame({"Symbol": ["NABIL", "NIMB"], "Sector": ["Banks", "Banks B"]})
+
+
+@pytest.fixture
+def series(store):
+    return value_portfolio_over_time(JOURNAL, store=store, sector_df=SECTORS)
+
+
+def test_totals_follow_holdings_and_prices(series):
+    totals = series.totals.set_index(series.totals["Date"].dt.strftime("%Y-%m-%d"))
+
+    # 12-14: both NABIL lots held; NIMB not bought yet
+    assert totals.loc["2025-12-14", "Investment_NPR"] == pytest.approx(10 * 480 + 4 * 450)
+    assert totals.loc["2025-12-14", "Market_Value_NPR"] == pytest.approx(14 * 492)
+    # 12-21: NIMB bought on 12-20
+    assert totals.loc["2025-12-21", "Market_Value_NPR"] == pytest.approx(14 * 500 + 20 * 195)
+    # 12-24: the 4-share lot was sold on 12-22
+    assert totals.loc["2025-12-24", "Investment_NPR"] == pytest.approx(10 * 480 + 20 * 200)
+    assert totals.loc["2025-12-24", "Market_Value_NPR"] == pytest.approx(10 * 510 + 20 * 193)
+
+    assert np.isnan(totals["Day_PL"].iloc[0])
+    assert totals["Day_PL"].iloc[1:].tolist() == pytest.approx(totals["PL"].diff().iloc[1:].tolist())
+
+
+def test_sector_share_is_of_market_value(series):
+    last = series.by_sector[series.by_sector["Date"] == series.by_sector["Date"].max()]
+    share = last.set_index("Sector")["MV_Allocation%"]
+
+    mv = {"Banks": 10 * 510, "Banks B": 20 * 193}
+    assert share["Banks"] == pytest.approx(mv["Banks"] / sum(mv.values()))
+    assert share.sum() == pytest.approx(1.0)
+
+
+def test_by_symbol_only_holds_open_positions(series):
+    held = series.by_symbol.groupby(series.by_symbol["Date"].dt.strftime("%Y-%m-%d"))["Symbol"].apply(sorted)
+    assert held["2025-12-14"] == ["NABIL"]
+    assert held["2025-12-24"] == ["NABIL", "NIMB"]